@@ -1,7 +1,10 @@
 import sys
 import os
 import glob
-import sqlite3
+import response_store
+import survey_loader
+import survey_dataset
+import question_bank
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
@@ -9,7 +12,7 @@ from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
 from PyQt5.QtWidgets import (QApplication, QWidget, QVBoxLayout, QHBoxLayout, 
                            QLabel, QComboBox, QTabWidget, QPushButton,
                            QFileDialog, QMessageBox, QScrollArea, QGroupBox,
-                           QGridLayout, QSplitter)
+                           QGridLayout, QSplitter, QProgressDialog)
 from PyQt5.QtCore import Qt
 import matplotlib
 matplotlib.use('Qt5Agg')  # Set the backend to Qt5Agg
@@ -30,38 +33,9 @@ class AnalysisApp(QWidget):
         
         # Load question definitions for reference
         try:
-            self.questions_df = pd.read_excel('survey_questions.xlsx')
-            
-            # Check for required columns and map them if they have different names
-            required_columns = ['QuestionID', 'Category', 'Question', 
-                              'Option1', 'Option2', 'Option3', 'Option4']
-            
-            # Map of expected column names to potential alternatives
-            column_alternatives = {
-                'QuestionID': ['QuestionID', 'Question_ID', 'Id', 'ID'],
-                'Category': ['Category', 'Section', 'Type'],
-                'Question': ['Question', 'QuestionText', 'Text'],
-                'Option1': ['Option1', 'Option_1', 'Choice1'],
-                'Option2': ['Option2', 'Option_2', 'Choice2'],
-                'Option3': ['Option3', 'Option_3', 'Choice3'],
-                'Option4': ['Option4', 'Option_4', 'Choice4']
-            }
-            
-            # Check and rename columns if needed
-            actual_columns = self.questions_df.columns.tolist()
-            for expected, alternatives in column_alternatives.items():
-                if expected not in actual_columns:
-                    # Try to find an alternative
-                    for alt in alternatives:
-                        if alt in actual_columns:
-                            self.questions_df.rename(columns={alt: expected}, inplace=True)
-                            print(f"Renamed column '{alt}' to '{expected}'")
-                            break
-            
-            # Verify all required columns exist
-            missing_columns = [col for col in required_columns if col not in self.questions_df.columns]
-            if missing_columns:
-                raise KeyError(f"Missing required columns: {', '.join(missing_columns)}")
+            # Parsed once and cached per user, columns normalized
+            self.question_bank = question_bank.load_question_bank()
+            self.questions_df = self.question_bank.questions_df
                 
         except FileNotFoundError:
             QMessageBox.critical(self, "Error", "survey_questions.xlsx file not found! Please run the question generator first.")
@@ -70,8 +44,15 @@ class AnalysisApp(QWidget):
             QMessageBox.critical(self, "Error", f"Error loading questions file: {str(e)}")
             sys.exit(1)
             
-        self.merged_data = None
         self.responses_df = None
+        self.cube = None
+        
+        # Remembers ingested files so refreshes only read what changed
+        self.dataset = survey_dataset.SurveyDataset(self.questions_df['QuestionID'])
+        self.selected_files = []
+        
+        # Side table for question text and options, keyed by QuestionID
+        self.question_info = self.questions_df.drop_duplicates('QuestionID').set_index('QuestionID')
         
         # Create main layout
         main_layout = QVBoxLayout()
@@ -82,7 +63,11 @@ class AnalysisApp(QWidget):
         self.load_button = QPushButton("Load Survey Data")
         self.load_button.clicked.connect(self.load_survey_data)
         
+        self.refresh_button = QPushButton("Refresh")
+        self.refresh_button.clicked.connect(self.refresh_survey_data)
+        
         controls_layout.addWidget(self.load_button)
+        controls_layout.addWidget(self.refresh_button)
         controls_layout.addStretch(1)
         
         # Analysis tabs
@@ -172,73 +157,78 @@ class AnalysisApp(QWidget):
     def update_question_list(self, category):
         self.question_combo.clear()
         
-        category_questions = self.questions_df[self.questions_df['Category'] == category]
-        for _, row in category_questions.iterrows():
-            self.question_combo.addItem(row['Question'], row['QuestionID'])
+        for question in self.question_bank.questions(category):
+            self.question_combo.addItem(question.Question, question.QuestionID)
     
     def load_survey_data(self):
         # Let user select multiple DB files
         files, _ = QFileDialog.getOpenFileNames(
-            self, "Select Survey Database Files", "", "SQLite Files (*.db)"
+            self, "Select Survey Database Files", response_store.STORE_PATH, "SQLite Files (*.db)"
         )
         
         if not files:
             return
         
-        # Merge data from all selected files
-        all_responses = []
-        all_users = []
+        self.selected_files = files
         
-        for file in files:
-            try:
-                conn = sqlite3.connect(file)
-                
-                # Get responses
-                responses_df = pd.read_sql_query("SELECT * FROM responses", conn)
-                responses_df['db_file'] = os.path.basename(file)
-                all_responses.append(responses_df)
-                
-                # Get user info
-                user_df = pd.read_sql_query("SELECT * FROM user_info", conn)
-                user_df['db_file'] = os.path.basename(file)
-                all_users.append(user_df)
-                
-                conn.close()
-            except Exception as e:
-                QMessageBox.warning(self, "Error", f"Could not load data from {file}: {str(e)}")
+        if self.refresh_survey_data():
+            QMessageBox.information(
+                self, "Data Loaded", 
+                f"Successfully loaded data from {len(files)} survey files.\n"
+                f"Total responses: {len(self.users_df)}"
+            )
+    
+    def refresh_survey_data(self):
+        """Re-read only the selected files that are new or changed since the last load"""
+        if not self.selected_files:
+            return False
+        
+        # Read the files on a thread pool, reporting progress as they finish
+        progress = QProgressDialog("Loading survey files...", "Cancel", 0, len(self.selected_files), self)
+        progress.setWindowModality(Qt.WindowModal)
+        progress.setMinimumDuration(0)
+        
+        def report_progress(done, total):
+            progress.setMaximum(total)
+            progress.setValue(done)
+            QApplication.processEvents()
+            return not progress.wasCanceled()
         
-        if not all_responses or not all_users:
+        try:
+            _, errors = self.dataset.refresh(self.selected_files, progress=report_progress)
+        except survey_loader.LoadCancelled:
+            return False
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Error loading data: {str(e)}")
+            return False
+        finally:
+            progress.close()
+        
+        if errors:
+            details = "\n".join(f"{os.path.basename(file)}: {str(e)}" for file, e in errors[:10])
+            QMessageBox.warning(self, "Error", f"Could not load data from {len(errors)} files:\n{details}")
+        
+        if self.dataset.responses_df is None or self.dataset.responses_df.empty:
             QMessageBox.warning(self, "No Data", "No valid data found in selected files.")
-            return
+            return False
         
         try:
-            # Combine all data
-            self.responses_df = pd.concat(all_responses)
-            self.users_df = pd.concat(all_users)
-            
-            # Merge with question definitions
-            self.merged_data = pd.merge(
-                self.responses_df,
-                self.questions_df,
-                left_on='question_id',
-                right_on='QuestionID'
-            )
+            # Responses are compact codes; question metadata stays in self.question_info
+            self.responses_df = self.dataset.responses_df
+            self.users_df = self.dataset.users_df
+            self.cube = self.dataset.cube
             
             # Update all analyses
             self.update_overall_analysis()
             self.update_section_analysis(self.section_combo.currentText())
             self.update_question_analysis(self.question_combo.currentText())
-            
-            QMessageBox.information(
-                self, "Data Loaded", 
-                f"Successfully loaded data from {len(files)} survey files.\n"
-                f"Total responses: {len(self.users_df)}"
-            )
+            return True
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Error processing data: {str(e)}")
+            return False
     
     def update_overall_analysis(self):
-        if self.merged_data is None:
+        if self.cube is None:
             return
         
         try:
@@ -246,7 +236,7 @@ class AnalysisApp(QWidget):
             self.overall_canvas.axes.clear()
             
             # Calculate average scores by category
-            category_scores = self.merged_data.groupby('Category')['response'].mean()
+            category_scores = self.cube.category_means()
             
             # Create bar chart
             bars = self.overall_canvas.axes.bar(category_scores.index, category_scores.values)
@@ -270,27 +260,24 @@ class AnalysisApp(QWidget):
             QMessageBox.warning(self, "Error", f"Error updating overall analysis: {str(e)}")
     
     def update_section_analysis(self, category):
-        if self.merged_data is None:
+        if self.cube is None:
             return
         
         try:
             # Clear the canvas
             self.section_canvas.axes.clear()
             
-            # Filter for selected category
-            category_data = self.merged_data[self.merged_data['Category'] == category]
+            # Average scores by question, straight from the cube
+            question_scores = self.cube.question_means(category)
             
-            if category_data.empty:
+            if question_scores.empty:
                 self.section_canvas.axes.text(0.5, 0.5, f"No data for {category} category",
                                             ha='center', va='center')
                 self.section_canvas.draw()
                 return
             
-            # Calculate average scores by question
-            question_scores = category_data.groupby(['QuestionID', 'Question'])['response'].mean()
-            
             # Create bar chart
-            questions = [q[1] for q in question_scores.index]
+            questions = self.question_info.loc[question_scores.index, 'Question'].tolist()
             shortened_questions = [q[:30] + '...' if len(q) > 30 else q for q in questions]
             
             bars = self.section_canvas.axes.bar(range(len(shortened_questions)), question_scores.values)
@@ -316,7 +303,7 @@ class AnalysisApp(QWidget):
             QMessageBox.warning(self, "Error", f"Error updating section analysis: {str(e)}")
     
     def update_question_analysis(self, question_text):
-        if self.merged_data is None or not question_text:
+        if self.cube is None or not question_text:
             return
         
         try:
@@ -326,24 +313,20 @@ class AnalysisApp(QWidget):
             # Clear the canvas
             self.question_canvas.axes.clear()
             
-            # Filter for selected question
-            question_data = self.merged_data[self.merged_data['QuestionID'] == question_id]
+            # Count responses for each option, straight from the cube
+            option_counts = self.cube.option_counts(question_id)
             
-            if question_data.empty:
+            if option_counts.empty:
                 self.question_canvas.axes.text(0.5, 0.5, "No data for this question",
                                              ha='center', va='center')
                 self.question_canvas.draw()
                 return
             
-            # Count responses for each option
-            option_counts = question_data['response'].value_counts().sort_index()
-            
             # Get option labels
+            question_row = self.question_info.loc[question_id]
             option_labels = []
             for i in range(1, 5):
-                col_name = f'Option{i}'
-                option_text = question_data[col_name].iloc[0] if not question_data.empty else f"Option {i}"
-                option_labels.append(f"{i}: {option_text}")
+                option_labels.append(f"{i}: {question_row[f'Option{i}']}")
             
             # Create values for all options (1-4), even if some have zero responses
             all_options = pd.Series([0, 0, 0, 0], index=[1, 2, 3, 4])
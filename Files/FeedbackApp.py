@@ -1,8 +1,9 @@
 import sys
 import os
 import datetime
-import pandas as pd
-import sqlite3
+import response_store
+import lazy_questions
+import question_bank
 from PyQt6.QtWidgets import (QApplication, QWidget, QTabWidget, QVBoxLayout, 
                              QLabel, QRadioButton, QButtonGroup, QScrollArea,
                              QPushButton, QLineEdit, QFormLayout, QMessageBox,
@@ -17,10 +18,14 @@ class SurveyApp(QWidget):
         
         # Load questions from Excel
         try:
-            self.questions_df = pd.read_excel('survey_questions.xlsx')
+            self.question_bank = question_bank.load_question_bank()
+            self.questions_df = self.question_bank.questions_df
         except FileNotFoundError:
             QMessageBox.critical(self, "Error", "survey_questions.xlsx file not found!")
             sys.exit(1)
+        
+        # QuestionID -> Category lookup used when writing responses
+        self.question_categories = self.question_bank.categories
             
         # User information
         self.user_info_layout = QFormLayout()
@@ -39,6 +44,9 @@ class SurveyApp(QWidget):
         self.categories = ["Cultural", "Development", "Ways of Working"]
         self.responses = {}
         
+        # Question widgets are built per tab as it is shown and scrolled
+        self.question_lists = []
+        
         for category in self.categories:
             scroll = QScrollArea()
             scroll.setWidgetResizable(True)
@@ -46,35 +54,20 @@ class SurveyApp(QWidget):
             container = QWidget()
             layout = QVBoxLayout(container)
             
-            # Filter questions for this category
-            category_questions = self.questions_df[self.questions_df['Category'] == category]
+            # Questions for this category
+            category_questions = self.question_bank.questions(category)
             
-            for _, row in category_questions.iterrows():
-                q_id = row['QuestionID']
-                question_text = row['Question']
-                
-                group_box = QGroupBox(question_text)
-                group_layout = QVBoxLayout()
-                
-                # Create radio buttons for options
-                option_group = QButtonGroup(self)
-                self.responses[q_id] = None
-                
-                options = [row['Option1'], row['Option2'], row['Option3'], row['Option4']]
-                option_values = [1, 2, 3, 4]  # Numeric values for options
-                
-                for i, (option, value) in enumerate(zip(options, option_values)):
-                    radio = QRadioButton(option)
-                    radio.setObjectName(f"{q_id}_{value}")
-                    radio.toggled.connect(self.on_radio_toggled)
-                    option_group.addButton(radio)
-                    group_layout.addWidget(radio)
-                
-                group_box.setLayout(group_layout)
-                layout.addWidget(group_box)
+            # Every question starts unanswered, whether or not its widgets exist yet
+            for question in category_questions:
+                self.responses[question.QuestionID] = None
             
             scroll.setWidget(container)
             self.tabs.addTab(scroll, category)
+            self.question_lists.append(
+                lazy_questions.LazyQuestionList(scroll, layout, category_questions, self.build_question)
+            )
+        
+        self.tabs.currentChanged.connect(self.show_tab)
         
         # Submit button
         self.submit_button = QPushButton("Submit Survey")
@@ -90,6 +83,37 @@ class SurveyApp(QWidget):
         main_layout.addWidget(self.submit_button)
         
         self.setLayout(main_layout)
+        
+        self.show_tab(self.tabs.currentIndex())
+    
+    def show_tab(self, index):
+        """Start building a tab's questions the first time it is shown"""
+        if 0 <= index < len(self.question_lists):
+            self.question_lists[index].start()
+    
+    def build_question(self, index, question):
+        """Create the group box and option buttons for one question"""
+        q_id = question.QuestionID
+        question_text = question.Question
+        
+        group_box = QGroupBox(question_text)
+        group_layout = QVBoxLayout()
+        
+        # Create radio buttons for options
+        option_group = QButtonGroup(self)
+        
+        options = [question.Option1, question.Option2, question.Option3, question.Option4]
+        option_values = [1, 2, 3, 4]  # Numeric values for options
+        
+        for i, (option, value) in enumerate(zip(options, option_values)):
+            radio = QRadioButton(option)
+            radio.setObjectName(f"{q_id}_{value}")
+            radio.toggled.connect(self.on_radio_toggled)
+            option_group.addButton(radio)
+            group_layout.addWidget(radio)
+        
+        group_box.setLayout(group_layout)
+        return group_box
     
     def on_radio_toggled(self):
         sender = self.sender()
@@ -119,52 +143,19 @@ class SurveyApp(QWidget):
             if reply == QMessageBox.StandardButton.No:
                 return
         
-        # Create SQLite database with timestamp
         timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-        db_filename = f"{name.replace(' ', '_')}_{timestamp}.db"
-        
-        conn = sqlite3.connect(db_filename)
-        cursor = conn.cursor()
-        
-        # Create tables
-        cursor.execute('''
-        CREATE TABLE user_info (
-            name TEXT,
-            email TEXT,
-            department TEXT,
-            timestamp TEXT
-        )
-        ''')
-        
-        cursor.execute('''
-        CREATE TABLE responses (
-            question_id TEXT,
-            category TEXT,
-            response INTEGER
-        )
-        ''')
-        
-        # Insert user info
-        cursor.execute(
-            "INSERT INTO user_info VALUES (?, ?, ?, ?)",
-            (name, email, dept, timestamp)
-        )
-        
-        # Insert responses
-        for q_id, response in self.responses.items():
-            # Get the category for this question
-            q_row = self.questions_df[self.questions_df['QuestionID'] == q_id].iloc[0]
-            category = q_row['Category']
-            
-            cursor.execute(
-                "INSERT INTO responses VALUES (?, ?, ?)",
-                (q_id, category, response if response is not None else -1)
-            )
         
-        conn.commit()
-        conn.close()
+        # Resolve categories from the prebuilt lookup rather than scanning questions_df
+        responses = response_store.build_responses(self.responses, self.question_categories)
+        
+        # Append to the shared response store
+        conn = response_store.connect()
+        try:
+            response_store.append_submission(conn, name, email, dept, timestamp, responses)
+        finally:
+            conn.close()
         
-        QMessageBox.information(self, "Success", f"Survey submitted successfully!\nSaved to {db_filename}")
+        QMessageBox.information(self, "Success", f"Survey submitted successfully!\nSaved to {response_store.STORE_PATH}")
         self.close()
 
 if __name__ == "__main__":
@@ -0,0 +1,109 @@
+from collections import OrderedDict
+from matplotlib.figure import Figure
+import chart_hover
+
+
+class RenderCacheMixin:
+    """
+    Render cache for a matplotlib canvas used by the analysis dashboards.
+
+    Every render goes onto a fresh figure (new_figure), which is kept with its
+    rendered pixels once drawn (cache_render). Showing the same view again
+    swaps that figure back onto the canvas and blits the pixels (show_cached)
+    instead of rebuilding the chart.
+
+    The canvas class calls init_render_cache from its __init__, after the
+    FigureCanvas itself is set up, and keeps its current figure in self.fig
+    and its axes in self.axes.
+    """
+    # Per-render state that travels with a cached figure
+    RENDER_ATTRS = ('annot', 'tooltip')
+
+    def init_render_cache(self, cache_size=16):
+        # Rendered figures keyed by (view, selection, data version), least recently used first
+        self.render_cache = OrderedDict()
+        self.cache_size = cache_size
+
+        # One set of hover connections for the canvas, moved along with the figure on screen
+        self.hover_manager = chart_hover.HoverManager(self)
+
+    def new_annotation(self):
+        """Hover label on the current axes, hidden until the pointer is over something"""
+        self.annot = self.axes.annotate("", xy=(0,0), xytext=(20,20),
+                                       textcoords="offset points",
+                                       bbox=dict(boxstyle="round", fc="white", alpha=0.8),
+                                       arrowprops=dict(arrowstyle="->"))
+        self.annot.set_visible(False)
+
+    def new_figure(self):
+        """Start a render on a fresh figure so previously cached ones stay intact"""
+        self.hover_manager.detach()
+        # Created at the unscaled dpi so it rescales like the first figure on
+        # screens with another pixel ratio, then matched to the current one
+        fig = Figure(figsize=self.fig.get_size_inches(), dpi=self.fig.dpi / self.device_pixel_ratio)
+        fig.set_dpi(self.fig.dpi)
+        fig.set_canvas(self)
+        self.figure = fig
+        self.fig = fig
+        self.axes = fig.add_subplot(111)
+
+        # Drop hover state left over from the previous render
+        for name in self.RENDER_ATTRS:
+            self.__dict__.pop(name, None)
+
+        self.new_annotation()
+        self.attach_tooltip()
+
+    def attach_tooltip(self):
+        """Hook a blitting hover tooltip up to the current figure"""
+        self.tooltip = chart_hover.HoverTooltip(self, self.annot)
+        self.hover_manager.attach(self.tooltip)
+
+    def cache_render(self, key):
+        """Remember the figure that was just drawn, along with its rendered pixels"""
+        self.render_cache[key] = {
+            'fig': self.fig,
+            'axes': self.axes,
+            'attrs': {name: self.__dict__[name] for name in self.RENDER_ATTRS if name in self.__dict__},
+            'background': self.copy_from_bbox(self.fig.bbox),
+            'size': (tuple(self.fig.get_size_inches()), self.fig.dpi),
+        }
+        self.render_cache.move_to_end(key)
+        while len(self.render_cache) > self.cache_size:
+            self.render_cache.popitem(last=False)
+
+    def show_cached(self, key):
+        """Swap back to a cached render; returns False if key was never rendered"""
+        entry = self.render_cache.get(key)
+        if entry is None:
+            return False
+        self.render_cache.move_to_end(key)
+
+        size = (tuple(self.fig.get_size_inches()), self.fig.dpi)
+        fig = entry['fig']
+        if entry['size'] != size:
+            # The widget was resized (or moved to another screen) since this render, so it has to be laid out again
+            fig.set_dpi(size[1])
+            fig.set_size_inches(size[0], forward=False)
+
+        # Event connections live on the figure, so move them over to the cached one
+        self.hover_manager.detach()
+        fig.set_canvas(self)
+        self.figure = fig
+        self.fig = fig
+        self.axes = entry['axes']
+        for name in self.RENDER_ATTRS:
+            self.__dict__.pop(name, None)
+        self.__dict__.update(entry['attrs'])
+        self.tooltip.reset()
+        self.hover_manager.attach(self.tooltip)
+
+        if entry['size'] == size:
+            # Same size: blit the stored pixels instead of redrawing
+            self.restore_region(entry['background'])
+            self.blit(fig.bbox)
+        else:
+            self.draw()
+            entry['background'] = self.copy_from_bbox(fig.bbox)
+            entry['size'] = size
+        return True
@@ -0,0 +1,163 @@
+from bisect import bisect_right
+import numpy as np
+
+
+def bar_anchor(bar):
+    """Top centre of a bar, where its tooltip arrow points"""
+    return (bar.get_x() + bar.get_width() / 2, bar.get_y() + bar.get_height())
+
+
+def wedge_anchor(wedge):
+    """Midpoint of a pie wedge, halfway out along its middle angle"""
+    angle = np.deg2rad((wedge.theta1 + wedge.theta2) / 2)
+    x, y = wedge.center
+    return (x + wedge.r / 2 * np.cos(angle), y + wedge.r / 2 * np.sin(angle))
+
+
+class IntervalIndex:
+    """
+    Sorted start positions of non-overlapping intervals (bar x-extents or
+    wedge angles), so the interval holding a value is found with a bisect
+    instead of testing every artist.
+    """
+    def __init__(self, starts, period=None):
+        self.order = sorted(range(len(starts)), key=starts.__getitem__)
+        self.starts = [starts[i] for i in self.order]
+        self.period = period
+
+    def candidates(self, value):
+        """Positions (in input order) of the interval holding value and its neighbours"""
+        count = len(self.starts)
+        if count == 0 or value is None:
+            return []
+        pos = bisect_right(self.starts, value) - 1
+        if self.period is None:
+            # Bars: the one starting at or before value, plus the next in case of touching edges
+            return [self.order[p] for p in (pos, pos + 1) if 0 <= p < count]
+        # Angles wrap around, so position -1 is the last interval
+        return [self.order[p % count] for p in dict.fromkeys((pos, pos - 1, pos + 1))]
+
+
+class HoverTooltip:
+    """
+    Hover tooltip for one rendered chart that never redraws the chart itself.
+
+    The annotation is animated, so a normal draw leaves it out and the result
+    is kept as the background. Moving the mouse only restores that background
+    and blits the annotation on top, and nothing is drawn at all while the
+    pointer stays on the same bar or wedge (or off all of them).
+    """
+    def __init__(self, canvas, annot):
+        self.canvas = canvas
+        self.annot = annot
+        self.annot.set_animated(True)
+        self.annot.set_visible(False)
+
+        self.artists = []
+        self.texts = []
+        self.anchors = []
+        self.index = None
+        self.key = None
+        self.background = None
+        self.active = None
+
+    def set_bars(self, bars, texts):
+        """Show texts[i] when hovering bars[i]"""
+        self._set_targets(bars, texts, [bar_anchor(bar) for bar in bars])
+        self.index = IntervalIndex([bar.get_x() for bar in self.artists])
+        self.key = lambda event: event.xdata
+
+    def set_wedges(self, wedges, texts):
+        """Show texts[i] when hovering wedges[i]"""
+        self._set_targets(wedges, texts, [wedge_anchor(wedge) for wedge in wedges])
+        # Exploded wedges are shifted off the pie centre, their mean is close enough to pick a candidate
+        centre = np.mean([wedge.center for wedge in self.artists], axis=0) if self.artists else (0, 0)
+        self.index = IntervalIndex([wedge.theta1 % 360 for wedge in self.artists], period=360)
+        self.key = lambda event: np.degrees(np.arctan2(event.ydata - centre[1], event.xdata - centre[0])) % 360
+
+    def _set_targets(self, artists, texts, anchors):
+        self.artists = list(artists)
+        self.texts = list(texts)
+        self.anchors = anchors
+        self.reset()
+
+    def reset(self):
+        """Hide the tooltip, e.g. when the chart is shown again from the cache"""
+        self.active = None
+        self.annot.set_visible(False)
+
+    def on_draw(self, event):
+        # A full draw just happened without the annotation, keep it as the background
+        self.background = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        if self.active is not None:
+            self._blit()
+
+    def on_move(self, event):
+        index = self.find(event) if event.inaxes else None
+        if index == self.active:
+            return
+        self.active = index
+
+        if index is None:
+            self.annot.set_visible(False)
+        else:
+            self.annot.set_text(self.texts[index])
+            self.annot.xy = self.anchors[index]
+            self.annot.set_visible(True)
+        self._blit()
+
+    def find(self, event):
+        """Index of the artist under the pointer, or None"""
+        if self.index is None or event.inaxes is not self.annot.axes:
+            return None
+        # The index narrows it down to a few neighbours, the artists confirm the hit
+        for i in self.index.candidates(self.key(event)):
+            if self.artists[i].contains_point([event.x, event.y]):
+                return i
+        return None
+
+    def _blit(self):
+        if self.background is None:
+            return
+        self.canvas.restore_region(self.background)
+        if self.annot.get_visible():
+            self.canvas.figure.draw_artist(self.annot)
+        self.canvas.blit(self.canvas.figure.bbox)
+
+
+class HoverManager:
+    """
+    Owns the hover connections of one canvas.
+
+    Only the figure on screen is connected, and only once: attaching the
+    tooltip of a newly shown chart first disconnects the previous one, so
+    handlers never pile up however often the views are redrawn.
+    """
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.tooltip = None
+        self.cids = []
+
+    def attach(self, tooltip):
+        """Route the current figure's events to tooltip"""
+        self.detach()
+        self.tooltip = tooltip
+        self.cids = [
+            self.canvas.mpl_connect("draw_event", self.on_draw),
+            self.canvas.mpl_connect("motion_notify_event", self.on_move),
+        ]
+
+    def detach(self):
+        """Disconnect from the current figure; call before swapping it out"""
+        for cid in self.cids:
+            self.canvas.mpl_disconnect(cid)
+        self.cids = []
+        self.tooltip = None
+
+    def on_draw(self, event):
+        if self.tooltip is not None:
+            self.tooltip.on_draw(event)
+
+    def on_move(self, event):
+        if self.tooltip is not None:
+            self.tooltip.on_move(event)
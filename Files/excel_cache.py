@@ -0,0 +1,174 @@
+import hashlib
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401  (Parquet engine)
+    HAVE_PARQUET = True
+except ImportError:
+    HAVE_PARQUET = False
+
+# Sidecar folder created next to the workbooks
+CACHE_DIR_NAME = ".survey_cache"
+
+
+def file_hash(path, block_size=1 << 20):
+    """SHA-1 of a file's contents, used to key its cached frame"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def file_timestamp(path):
+    """
+    Timestamp of a results file, taken from a name like survey_YYYY-MM-DD.xlsx
+    and falling back to the file's modification time.
+    """
+    date_part = os.path.basename(path).split('_')[-1].split('.')[0]
+    try:
+        return pd.to_datetime(date_part)
+    except (ValueError, OverflowError):
+        # Not a date (DateParseError and OutOfBoundsDatetime are ValueErrors too)
+        return pd.to_datetime(os.path.getmtime(path), unit='s')
+
+
+def sidecar_path(cache_dir, digest):
+    """Parquet sidecar holding the parsed frame for a digest"""
+    return os.path.join(cache_dir, digest + '.parquet')
+
+
+def read_sidecar(cache_dir, digest):
+    """
+    Return the cached frame for digest, or None if it was never parsed.
+
+    A sidecar that can't be read (e.g. truncated) is deleted and treated as
+    missing, so the workbook is parsed again.
+    """
+    path = sidecar_path(cache_dir, digest)
+    if not HAVE_PARQUET or not os.path.exists(path):
+        return None
+    try:
+        return pd.read_parquet(path)
+    except Exception:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        return None
+
+
+def replace_atomically(path, write):
+    """
+    Call write(temp_path) on a temporary file next to path, then move it
+    into place, so readers never see a half-written sidecar.
+    """
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    os.close(fd)
+    try:
+        write(temp_path)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def write_sidecar(cache_dir, digest, df):
+    """
+    Store a parsed workbook as Parquet.
+
+    Nothing is cached without pyarrow, or for frames Parquet can't hold
+    (mixed-type object columns); those workbooks are parsed every time.
+    """
+    if not HAVE_PARQUET:
+        return
+    os.makedirs(cache_dir, exist_ok=True)
+    try:
+        replace_atomically(sidecar_path(cache_dir, digest), lambda temp_path: df.to_parquet(temp_path, index=False))
+    except (ValueError, TypeError, pyarrow.ArrowException):
+        pass
+
+
+def parse_workbook(path, digest, cache_dir):
+    """Parse one workbook and write its sidecar; runs in a worker process"""
+    df = pd.read_excel(path)
+    write_sidecar(cache_dir, digest, df)
+    return df
+
+
+def load_excel_folder(folder_path, max_workers=None, cache_dir=None):
+    """
+    Load every .xlsx/.xls results file in a folder.
+
+    Each workbook is keyed by the hash of its contents. Workbooks parsed
+    before are read back from their Parquet sidecar, the rest are parsed
+    on a process pool (openpyxl is pure Python and holds the GIL) and
+    cached for next time.
+
+    Parameters:
+    folder_path (str): folder containing the results workbooks
+    max_workers (int): worker processes for parsing, defaults to the CPU count
+    cache_dir (str): sidecar folder, defaults to .survey_cache inside folder_path
+
+    Returns:
+    (excel_files, frames, errors, digests) where frames holds one DataFrame
+    per loaded file with 'Source File' and 'Timestamp' added, errors is a
+    list of (file, exception) and digests maps each loaded file to its hash
+    """
+    cache_dir = cache_dir or os.path.join(folder_path, CACHE_DIR_NAME)
+    excel_files = sorted(f for f in os.listdir(folder_path)
+                         if f.endswith('.xlsx') or f.endswith('.xls'))
+
+    loaded = {}
+    digests = {}
+    errors = []
+    # digest -> files with those contents, so copies of a workbook are parsed once
+    to_parse = {}
+
+    for file in excel_files:
+        file_path = os.path.join(folder_path, file)
+        try:
+            digest = file_hash(file_path)
+            digests[file] = digest
+            df = read_sidecar(cache_dir, digest)
+        except Exception as e:
+            errors.append((file, e))
+            continue
+        if df is None:
+            to_parse.setdefault(digest, []).append(file)
+        else:
+            loaded[file] = df
+
+    if to_parse:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = {
+                digest: pool.submit(parse_workbook, os.path.join(folder_path, files[0]), digest, cache_dir)
+                for digest, files in to_parse.items()
+            }
+            for digest, future in futures.items():
+                files = to_parse[digest]
+                try:
+                    df = future.result()
+                except Exception as e:
+                    errors.extend((file, e) for file in files)
+                    continue
+                # Each file gets its own frame since the metadata columns differ
+                loaded[files[0]] = df
+                for file in files[1:]:
+                    loaded[file] = df.copy()
+
+    frames = []
+    for file in excel_files:
+        if file not in loaded:
+            continue
+        df = loaded[file]
+        # Metadata is added after caching since it depends on the name, not the contents
+        df['Source File'] = file
+        df['Timestamp'] = file_timestamp(os.path.join(folder_path, file))
+        frames.append(df)
+
+    return excel_files, frames, errors, {file: digests[file] for file in loaded}
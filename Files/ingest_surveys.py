@@ -0,0 +1,312 @@
+import argparse
+import datetime
+import hashlib
+import os
+import sys
+import pandas as pd
+from openpyxl import load_workbook
+import question_bank
+import response_store
+
+# Accepted column names for each field, first match wins
+COLUMN_ALTERNATIVES = {
+    'respondent': ['Respondent', 'RespondentID', 'Respondent ID', 'Email', 'email'],
+    'name': ['Name', 'name'],
+    'email': ['Email', 'email'],
+    'department': ['Department', 'department', 'Dept'],
+    'timestamp': ['Timestamp', 'timestamp', 'Date'],
+    'question_id': ['QuestionID', 'question_id', 'Question_ID'],
+    'question': ['Question', 'QuestionText'],
+    'category': ['Category', 'category', 'Section'],
+    'response': ['Selected Option', 'response', 'Response', 'Answer'],
+}
+
+SUPPORTED_EXTENSIONS = ('.csv', '.xlsx', '.xlsm', '.xls')
+
+# Legacy per-respondent databases written by FeedbackApp before the store
+LEGACY_EXTENSIONS = ('.db',)
+
+
+def resolve_columns(header):
+    """Map each field to the column that holds it in this export"""
+    columns = {}
+    for field, alternatives in COLUMN_ALTERNATIVES.items():
+        for alt in alternatives:
+            if alt in header:
+                columns[field] = alt
+                break
+    if 'question_id' not in columns and 'question' not in columns:
+        raise ValueError("Export must contain a QuestionID or Question column")
+    return columns
+
+
+def iter_rows(path, chunk_size=10000):
+    """Yield the rows of a CSV/Excel export as dicts without loading the whole file"""
+    ext = os.path.splitext(path)[1].lower()
+
+    if ext == '.csv':
+        for chunk in pd.read_csv(path, chunksize=chunk_size, dtype=str, keep_default_na=False):
+            yield from chunk.to_dict('records')
+    elif ext in ('.xlsx', '.xlsm'):
+        # Read-only mode streams rows instead of building the whole sheet
+        workbook = load_workbook(path, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            header = [str(h) if h is not None else '' for h in next(rows, ())]
+            for values in rows:
+                yield dict(zip(header, values))
+        finally:
+            workbook.close()
+    elif ext == '.xls':
+        # openpyxl cannot stream legacy .xls files
+        yield from pd.read_excel(path, dtype=str).fillna('').to_dict('records')
+    else:
+        raise ValueError(f"Unsupported file type: {path}")
+
+
+def parse_response(value):
+    """Convert an exported option (1-4) to an int, -1 when unanswered"""
+    if value is None or str(value).strip() in ('', 'nan', 'None'):
+        return -1
+    return int(float(value))
+
+
+def parse_timestamp(value, fallback):
+    """Normalise a timestamp cell to the store's YYYYMMDD_HHMMSS format"""
+    if value is None or str(value).strip() == '':
+        return fallback
+    if isinstance(value, str) and len(value) == 15 and value[8] == '_':
+        return value
+    return pd.to_datetime(value).strftime("%Y%m%d_%H%M%S")
+
+
+def load_question_lookup(questions_path):
+    """
+    Lookups into the question bank, or None without a question workbook.
+
+    Returns:
+    (by_text, by_section, by_id) mapping question text, (lower-case section,
+    question text) and the QuestionID as text to the bank's
+    (QuestionID, Category)
+    """
+    if not questions_path:
+        return None
+    bank = question_bank.load_question_bank(questions_path)
+    by_text = {}
+    by_section = {}
+    by_id = {}
+    for questions in bank.by_category.values():
+        for question in questions:
+            entry = (question.QuestionID, question.Category)
+            by_text[question.Question] = entry
+            by_section[(str(question.Category).lower(), question.Question)] = entry
+            by_id[str(question.QuestionID)] = entry
+    return by_text, by_section, by_id
+
+
+def resolve_question(row, columns, question_lookup, position):
+    """
+    (QuestionID, Category) of an export row, or None if the question bank
+    doesn't know it. The bank's category wins over the export's.
+
+    Without a question workbook, exports that only hold question text and
+    a section (temp.SurveyApp.export_results) get the ids temp.py uses,
+    section plus the question's position in it.
+    """
+    section = row.get(columns['category']) if 'category' in columns else None
+    if 'question_id' in columns:
+        q_id = row[columns['question_id']]
+        if question_lookup is None:
+            return q_id, section
+        return question_lookup[2].get(str(q_id).strip())
+
+    question = row.get(columns['question'])
+    if question_lookup is None:
+        return f"{str(section).lower()}_{position}", section
+    if section is not None:
+        entry = question_lookup[1].get((str(section).lower(), question))
+        if entry is not None:
+            return entry
+    return question_lookup[0].get(question)
+
+
+def iter_submissions(path, question_lookup, department="Unknown", wave=None, chunk_size=10000):
+    """
+    Group export rows into submissions for response_store.append_submissions.
+
+    Exports with a respondent column (e.g. Email) may hold many respondents,
+    whose rows are expected to be contiguous. Exports without one, such as
+    temp.SurveyApp.export_results, are treated as a single respondent.
+
+    Raises ValueError once the file is exhausted if any of its questions
+    couldn't be matched to the question bank.
+    """
+    file_stem = os.path.splitext(os.path.basename(path))[0]
+    file_time = datetime.datetime.fromtimestamp(os.path.getmtime(path)).strftime("%Y%m%d_%H%M%S")
+
+    columns = None
+    current = None
+    current_key = None
+    unmatched = set()
+
+    for row in iter_rows(path, chunk_size):
+        if columns is None:
+            columns = resolve_columns(row.keys())
+            if 'question_id' not in columns and 'category' not in columns and question_lookup is None:
+                raise ValueError(f"{path} has no QuestionID or Section column; "
+                                 "a question workbook is needed to map its question text")
+
+        key = row.get(columns['respondent']) if 'respondent' in columns else None
+        if current is None or key != current_key:
+            if current is not None:
+                yield current
+            current_key = key
+            current = {
+                'name': row.get(columns.get('name'), None) or file_stem,
+                'email': row.get(columns.get('email'), None) or '',
+                'department': row.get(columns.get('department'), None) or department,
+                'timestamp': parse_timestamp(row.get(columns.get('timestamp'), None), file_time),
+                'wave': wave,
+                'responses': [],
+            }
+            # Questions seen so far per section, for exports numbered by position
+            positions = {}
+
+        # Prefer an explicit id, else resolve the question text through the question bank
+        section = str(row.get(columns['category'])).lower() if 'category' in columns else None
+        position = positions.get(section, 0)
+        positions[section] = position + 1
+        resolved = resolve_question(row, columns, question_lookup, position)
+        if resolved is None:
+            unmatched.add(row.get(columns.get('question_id', columns.get('question')), None))
+            continue
+        q_id, category = resolved
+
+        current['responses'].append((q_id, category, parse_response(row.get(columns.get('response'), None))))
+
+    if current is not None:
+        yield current
+
+    # Raised last so the caller's transaction drops everything read from this file
+    if unmatched:
+        listed = ", ".join(str(question) for question in sorted(unmatched, key=str)[:10])
+        raise ValueError(f"{path}: {len(unmatched)} questions are not in the question bank: {listed}")
+
+
+def expand_paths(paths, extensions=SUPPORTED_EXTENSIONS):
+    """Expand directories into the files with the given extensions they contain"""
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.lower().endswith(extensions) and not name.startswith('~$'):
+                    yield os.path.join(path, name)
+        else:
+            yield path
+
+
+def file_digest(path):
+    """SHA-256 of an export's contents, used to recognise files ingested before"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def ingest_once(conn, path, write):
+    """
+    Run write(conn) for one source file in its own transaction, unless a file
+    with the same contents was ingested before, and record the file.
+
+    Returns:
+    the number of submissions write reported, 0 if the file was skipped
+    """
+    digest = file_digest(path)
+    with conn:
+        conn.execute("BEGIN IMMEDIATE")
+        if response_store.is_imported(conn, digest):
+            print(f"Skipping {path}, already ingested")
+            return 0
+        count = write(conn)
+        response_store.record_import(conn, digest, os.path.abspath(path), count)
+    return count
+
+
+def ingest(paths, store_path=response_store.STORE_PATH, batch_size=1000,
+           questions_path=None, department="Unknown", wave=None, legacy_paths=()):
+    """
+    Stream exports and legacy databases into the response store, returning
+    the submission count.
+
+    Each file is written in batches inside one transaction, so a file that
+    fails part way leaves nothing behind. Files are recorded by content
+    digest and skipped if they are ingested again.
+    """
+    question_lookup = load_question_lookup(questions_path)
+    conn = response_store.connect(store_path)
+    total = 0
+
+    def write_export(conn, path):
+        count = 0
+        batch = []
+        for submission in iter_submissions(path, question_lookup, department, wave):
+            batch.append(submission)
+            if len(batch) >= batch_size:
+                count += len(response_store.insert_submissions(conn, batch))
+                batch = []
+                print(f"Ingested {total + count} submissions...")
+
+        if batch:
+            count += len(response_store.insert_submissions(conn, batch))
+        return count
+
+    def write_legacy(conn, path):
+        response_store.import_legacy_db(conn, path)
+        return 1
+
+    try:
+        for path in expand_paths(paths):
+            total += ingest_once(conn, path, lambda conn: write_export(conn, path))
+        for path in expand_paths(legacy_paths, LEGACY_EXTENSIONS):
+            total += ingest_once(conn, path, lambda conn: write_legacy(conn, path))
+    finally:
+        conn.close()
+
+    return total
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Bulk-load survey exports (CSV/Excel) and legacy databases into the response store."
+    )
+    parser.add_argument("paths", nargs="*", help="Export files or folders containing them")
+    parser.add_argument("--legacy-db", action="append", default=[], metavar="PATH",
+                        help="Legacy per-respondent database (<name>_<timestamp>.db) or a folder "
+                             "of them to copy into the store; may be repeated")
+    parser.add_argument("--store", default=response_store.STORE_PATH,
+                        help=f"Response store database (default: {response_store.STORE_PATH})")
+    parser.add_argument("--questions", default=None,
+                        help="Question workbook giving each question's QuestionID and Category")
+    parser.add_argument("--batch-size", type=int, default=1000,
+                        help="Submissions inserted per batch (default: 1000)")
+    parser.add_argument("--department", default="Unknown",
+                        help="Department for exports without a Department column")
+    parser.add_argument("--wave", default=None,
+                        help="Survey wave (YYYY-MM); derived from the timestamp when omitted")
+    args = parser.parse_args(argv)
+    if not args.paths and not args.legacy_db:
+        parser.error("give export files or --legacy-db databases to ingest")
+
+    try:
+        total = ingest(args.paths, args.store, args.batch_size, args.questions,
+                       args.department, args.wave, args.legacy_db)
+    except Exception as e:
+        print(f"Error: {str(e)}", file=sys.stderr)
+        return 1
+
+    print(f"Ingested {total} submissions into {args.store}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+class LazyQuestionList:
+    """
+    Question widgets for one scrollable tab, created only as they are needed.
+
+    Nothing is built until the tab is first shown with start(). From then on
+    questions are only built until they reach a screen's height below the
+    visible area, and more follow as the tab is scrolled, so a long survey
+    opens with a couple of screenfuls of widgets instead of all of them.
+    Answers live in the caller's model (a dict of responses), not in the
+    widgets, so questions that were never built still submit.
+
+    Only the scroll area's own signals are used, so this works with both the
+    PyQt6 and the PySide6 forms.
+    """
+    def __init__(self, scroll_area, layout, questions, build_question):
+        """
+        Parameters:
+        scroll_area: QScrollArea showing the tab's container widget
+        layout: layout of the container widget the question widgets go in
+        questions (list): question records, in display order
+        build_question (callable): build_question(index, question) returns the widget for one question
+        """
+        self.scroll_area = scroll_area
+        self.layout = layout
+        self.questions = questions
+        self.build_question = build_question
+        self.built = 0
+        self.built_height = 0
+        self.started = False
+
+    def start(self):
+        """Begin filling the tab; called when it is first shown"""
+        if self.started:
+            return
+        self.started = True
+        bar = self.scroll_area.verticalScrollBar()
+        bar.valueChanged.connect(self.fill)
+        # The range changes when the viewport is resized
+        bar.rangeChanged.connect(self.fill)
+        self.fill()
+
+    def stop(self):
+        """Stop reacting to scrolling, e.g. before the tab is rebuilt"""
+        if not self.started:
+            return
+        bar = self.scroll_area.verticalScrollBar()
+        bar.valueChanged.disconnect(self.fill)
+        bar.rangeChanged.disconnect(self.fill)
+        self.started = False
+
+    def fill(self, *args):
+        """Build questions until they reach a screen's height below the visible area"""
+        if self.built >= len(self.questions):
+            return
+
+        # Measured against the screen rather than the viewport, which may not be laid out yet
+        target = (self.scroll_area.verticalScrollBar().value()
+                  + self.scroll_area.viewport().height()
+                  + self.scroll_area.screen().availableGeometry().height())
+        spacing = max(self.layout.spacing(), 0)
+
+        while self.built < len(self.questions) and self.built_height < target:
+            widget = self.build_question(self.built, self.questions[self.built])
+            # Insert ahead of any trailing stretch the caller added
+            self.layout.insertWidget(self.built, widget)
+            self.built_height += widget.sizeHint().height() + spacing
+            self.built += 1
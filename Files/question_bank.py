@@ -0,0 +1,149 @@
+import hashlib
+import io
+import json
+import os
+from collections import namedtuple
+import pandas as pd
+
+QUESTIONS_PATH = 'survey_questions.xlsx'
+
+REQUIRED_COLUMNS = ['QuestionID', 'Category', 'Question',
+                    'Option1', 'Option2', 'Option3', 'Option4']
+
+# Map of expected column names to potential alternatives
+COLUMN_ALTERNATIVES = {
+    'QuestionID': ['QuestionID', 'Question_ID', 'Id', 'ID'],
+    'Category': ['Category', 'Section', 'Type'],
+    'Question': ['Question', 'QuestionText', 'Text'],
+    'Option1': ['Option1', 'Option_1', 'Choice1'],
+    'Option2': ['Option2', 'Option_2', 'Choice2'],
+    'Option3': ['Option3', 'Option_3', 'Choice3'],
+    'Option4': ['Option4', 'Option_4', 'Choice4']
+}
+
+Question = namedtuple('Question', REQUIRED_COLUMNS)
+
+# path -> ((size, mtime), DataFrame) for workbooks already read by this process
+_loaded = {}
+
+
+def cache_path(path):
+    """
+    JSON file caching a workbook's parsed frame, in the user's cache folder
+    rather than next to the workbook, named after the workbook's full path
+    """
+    base = os.environ.get('LOCALAPPDATA') or os.environ.get('XDG_CACHE_HOME') \
+        or os.path.join(os.path.expanduser('~'), '.cache')
+    name = hashlib.sha1(os.path.abspath(path).encode('utf-8')).hexdigest()
+    return os.path.join(base, 'survey_questions', f"{name}.json")
+
+
+def read_workbook(path):
+    """
+    Read a question workbook, parsing it with openpyxl only when it changed.
+
+    The parsed frame is cached as JSON (orient='table', which keeps the
+    dtypes) together with the workbook's size and mtime, and reused for as
+    long as those match. Each call returns its own copy, so callers may
+    modify it.
+    """
+    stat = os.stat(path)
+    key = [stat.st_size, stat.st_mtime_ns]
+
+    loaded = _loaded.get(path)
+    if loaded is not None and loaded[0] == key:
+        return loaded[1].copy()
+
+    df = None
+    cache_file = cache_path(path)
+    try:
+        with open(cache_file, encoding='utf-8') as f:
+            cached = json.load(f)
+        if cached['key'] == key:
+            df = pd.read_json(io.StringIO(cached['table']), orient='table')
+    except (OSError, KeyError, ValueError):
+        # No cache yet, or an unreadable one
+        pass
+
+    if df is None:
+        df = pd.read_excel(path)
+        try:
+            os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+            with open(cache_file, 'w', encoding='utf-8') as f:
+                json.dump({'key': key, 'table': df.to_json(orient='table', index=False)}, f)
+        except (OSError, ValueError):
+            # Without a cache the workbook is just parsed again next time
+            pass
+
+    _loaded[path] = (key, df)
+    return df.copy()
+
+
+def section_question_ids(questions_df):
+    """
+    QuestionIDs for a workbook that has none, numbered the way temp.SurveyApp
+    numbers its questions: lower-case section, then position in the section
+    """
+    sections = questions_df['Category'].astype(str).str.lower()
+    return sections + '_' + sections.groupby(sections).cumcount().astype(str)
+
+
+def normalize_columns(questions_df):
+    """
+    Rename alternative column names in place and check the required ones exist.
+
+    Section-based workbooks without a QuestionID column (the ones temp.py
+    loads) get ids derived from their sections.
+    """
+    actual_columns = questions_df.columns.tolist()
+    for expected, alternatives in COLUMN_ALTERNATIVES.items():
+        if expected not in actual_columns:
+            # Try to find an alternative
+            for alt in alternatives:
+                if alt in actual_columns:
+                    questions_df.rename(columns={alt: expected}, inplace=True)
+                    print(f"Renamed column '{alt}' to '{expected}'")
+                    break
+
+    if 'QuestionID' not in questions_df.columns and 'Category' in questions_df.columns:
+        questions_df['QuestionID'] = section_question_ids(questions_df)
+
+    missing_columns = [col for col in REQUIRED_COLUMNS if col not in questions_df.columns]
+    if missing_columns:
+        raise KeyError(f"Missing required columns: {', '.join(missing_columns)}")
+
+
+class QuestionBank:
+    """
+    The survey questions, with per-category tuples built once.
+
+    questions(category) returns Question namedtuples (QuestionID, Category,
+    Question, Option1-4) in workbook order, so the apps can build their
+    widgets without iterrows or per-category boolean filters.
+    """
+    def __init__(self, questions_df):
+        self.questions_df = questions_df
+        # QuestionID -> Category lookup used when writing responses
+        self.categories = dict(zip(questions_df['QuestionID'], questions_df['Category']))
+
+        self.by_category = {}
+        for row in questions_df[REQUIRED_COLUMNS].itertuples(index=False, name=None):
+            question = Question(*row)
+            self.by_category.setdefault(question.Category, []).append(question)
+        self.by_category = {category: tuple(rows) for category, rows in self.by_category.items()}
+
+    def questions(self, category):
+        """Questions of one category, as a tuple of Question"""
+        return self.by_category.get(category, ())
+
+
+def load_question_bank(path=QUESTIONS_PATH):
+    """
+    Load the question workbook used by the survey and analysis apps.
+
+    Raises FileNotFoundError if the workbook is missing and KeyError if
+    required columns can't be found under any of their alternative names.
+    """
+    questions_df = read_workbook(path)
+    normalize_columns(questions_df)
+    return QuestionBank(questions_df)
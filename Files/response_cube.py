@@ -0,0 +1,95 @@
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+# Dimensions of the aggregate cube, in index order
+CUBE_LEVELS = ['question_id', 'response', 'category', 'department', 'wave']
+
+
+class ResponseCube:
+    """
+    Response counts per question x option x category x department x wave.
+
+    Built once after the survey data is loaded; the dashboard views answer
+    from the small rolled-up series instead of scanning every response row.
+    """
+    def __init__(self, counts):
+        self.counts = counts
+        # The views never split by department or wave, so those levels are rolled up
+        self.by_question = counts.groupby(level=['category', 'question_id', 'response']).sum()
+        self.by_option = counts.groupby(level=['question_id', 'response']).sum()
+
+    def add(self, other):
+        """Return a cube with another cube's counts added in"""
+        counts = self.counts.add(other.counts, fill_value=0).astype('int64')
+        return ResponseCube(counts)
+
+    def subtract(self, other):
+        """Return a cube with another cube's counts taken out"""
+        counts = self.counts.sub(other.counts, fill_value=0).astype('int64')
+        return ResponseCube(counts[counts > 0])
+
+    def category_means(self):
+        """Average response per category"""
+        return self._weighted_mean(self.by_question, 'category')
+
+    def question_means(self, category):
+        """Average response per question within a category"""
+        if category not in self.by_question.index.get_level_values('category'):
+            return pd.Series(dtype=float)
+        return self._weighted_mean(self.by_question.xs(category, level='category'), 'question_id')
+
+    def option_counts(self, question_id):
+        """Number of responses per option value for one question"""
+        if question_id not in self.by_option.index.get_level_values('question_id'):
+            return pd.Series(dtype='int64')
+        return self.by_option.xs(question_id, level='question_id')
+
+    @staticmethod
+    def _weighted_mean(counts, level):
+        responses = counts.index.get_level_values('response').to_numpy()
+        totals = (counts * responses).groupby(level=level).sum()
+        return totals / counts.groupby(level=level).sum()
+
+
+def encode_responses(responses_df, question_ids):
+    """
+    Store responses as compact codes instead of merging in the question table.
+
+    question_id becomes a categorical over the question table's QuestionID
+    values, so question text and options are looked up from that table by
+    id rather than being copied onto every response row.
+    """
+    encoded = pd.DataFrame({
+        'question_id': pd.Categorical(responses_df['question_id'],
+                                      categories=pd.Index(question_ids).unique()),
+        'category': responses_df['category'].astype('category'),
+        'response': pd.to_numeric(responses_df['response'], downcast='integer'),
+        'respondent': responses_df['respondent'].astype('category'),
+        'db_file': responses_df['db_file'].astype('category'),
+    })
+    # Responses to questions missing from the question table cannot be labelled
+    return encoded[encoded['question_id'].notna()].reset_index(drop=True)
+
+
+def concat_encoded(frames):
+    """Concatenate encoded response frames while keeping the columns categorical"""
+    columns = {}
+    for column in frames[0].columns:
+        parts = [frame[column] for frame in frames]
+        if isinstance(parts[0].dtype, pd.CategoricalDtype):
+            columns[column] = union_categoricals(parts, ignore_order=True)
+        else:
+            columns[column] = pd.concat(parts, ignore_index=True)
+    return pd.DataFrame(columns)
+
+
+def build_cube(responses_df, users_df):
+    """Aggregate loaded responses into a ResponseCube"""
+    respondents = users_df[['respondent', 'department', 'wave']].drop_duplicates('respondent')
+    rows = responses_df[['respondent', 'question_id', 'category', 'response']].merge(
+        respondents, on='respondent', how='left'
+    )
+    rows[['department', 'wave']] = rows[['department', 'wave']].fillna('Unknown')
+
+    counts = rows.groupby(CUBE_LEVELS, observed=True).size().rename('count')
+    return ResponseCube(counts)
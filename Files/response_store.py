@@ -0,0 +1,243 @@
+import os
+import sqlite3
+import pandas as pd
+
+# Single append-only database that replaces the one-file-per-respondent layout
+STORE_PATH = "survey_store.db"
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS submissions (
+    submission_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT,
+    email TEXT,
+    department TEXT,
+    timestamp TEXT,
+    wave TEXT
+);
+CREATE TABLE IF NOT EXISTS responses (
+    submission_id INTEGER NOT NULL REFERENCES submissions(submission_id),
+    question_id TEXT,
+    category TEXT,
+    response INTEGER
+);
+CREATE TABLE IF NOT EXISTS imports (
+    digest TEXT PRIMARY KEY,
+    path TEXT,
+    submissions INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_submissions_wave ON submissions(wave);
+CREATE INDEX IF NOT EXISTS idx_responses_submission ON responses(submission_id);
+CREATE INDEX IF NOT EXISTS idx_responses_question ON responses(question_id);
+'''
+
+
+def connect(path=STORE_PATH):
+    """Open the response store, creating the schema on first use"""
+    conn = sqlite3.connect(path)
+    # WAL lets the dashboards read while the survey form keeps appending
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def wave_for_timestamp(timestamp):
+    """Derive the survey wave (YYYY-MM) from a YYYYMMDD_HHMMSS timestamp"""
+    timestamp = str(timestamp)
+    if len(timestamp) >= 6 and timestamp[:6].isdigit():
+        return f"{timestamp[:4]}-{timestamp[4:6]}"
+    return "unknown"
+
+
+def build_responses(answers, categories):
+    """
+    Turn {question_id: response} answers into (question_id, category, response)
+    rows, resolving categories from a prebuilt {question_id: category} dict.
+    Unanswered questions (None) are stored as -1.
+    """
+    return [
+        (q_id, categories.get(q_id), response if response is not None else -1)
+        for q_id, response in answers.items()
+    ]
+
+
+def insert_submissions(conn, submissions):
+    """
+    Insert many respondents inside a write transaction the caller holds,
+    e.g. one opened with BEGIN IMMEDIATE, so that several batches can be
+    committed or rolled back together.
+
+    Parameters:
+    conn: connection returned by connect()
+    submissions (iterable): dicts with name, email, department, timestamp,
+        responses ((question_id, category, response) tuples) and optional wave
+
+    Returns:
+    list of the new submission ids, in input order
+    """
+    submission_ids = []
+    response_rows = []
+    cursor = conn.cursor()
+
+    for submission in submissions:
+        timestamp = submission['timestamp']
+        wave = submission.get('wave') or wave_for_timestamp(timestamp)
+        # SQLite hands out the id, so AUTOINCREMENT never reuses one and since_id reads stay correct
+        cursor.execute(
+            "INSERT INTO submissions (name, email, department, timestamp, wave) VALUES (?, ?, ?, ?, ?)",
+            (submission['name'], submission['email'], submission['department'], timestamp, wave)
+        )
+        submission_id = cursor.lastrowid
+        submission_ids.append(submission_id)
+        response_rows.extend(
+            (submission_id, q_id, category, response)
+            for q_id, category, response in submission['responses']
+        )
+
+    cursor.executemany(
+        "INSERT INTO responses (submission_id, question_id, category, response) VALUES (?, ?, ?, ?)",
+        response_rows
+    )
+
+    return submission_ids
+
+
+def append_submissions(conn, submissions):
+    """
+    Bulk-append many respondents in a single transaction.
+
+    Parameters:
+    conn: connection returned by connect()
+    submissions (iterable): see insert_submissions
+
+    Returns:
+    list of the new submission ids, in input order
+    """
+    with conn:
+        # Take the write lock up front so a busy store fails before any row is written
+        conn.execute("BEGIN IMMEDIATE")
+        return insert_submissions(conn, submissions)
+
+
+def is_imported(conn, digest):
+    """Check whether an export with this content digest was already ingested"""
+    row = conn.execute("SELECT 1 FROM imports WHERE digest = ?", (digest,)).fetchone()
+    return row is not None
+
+
+def record_import(conn, digest, path, submissions):
+    """Remember an ingested export, inside the transaction that wrote its rows"""
+    conn.execute(
+        "INSERT INTO imports (digest, path, submissions) VALUES (?, ?, ?)",
+        (digest, path, submissions)
+    )
+
+
+def append_submission(conn, name, email, department, timestamp, responses, wave=None):
+    """Append one respondent and their (question_id, category, response) rows"""
+    return append_submissions(conn, [{
+        'name': name,
+        'email': email,
+        'department': department,
+        'timestamp': timestamp,
+        'responses': responses,
+        'wave': wave,
+    }])[0]
+
+
+def is_store(conn):
+    """Check whether a database uses the consolidated store layout"""
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name='submissions'"
+    ).fetchone()
+    return row is not None
+
+
+def read_survey_db(path, wave=None, since_id=None):
+    """
+    Read responses and respondents from either the consolidated store or a
+    legacy per-respondent database.
+
+    Both layouts come back in the same shape: responses carry question_id,
+    category, response, db_file and respondent; users carry name, email,
+    department, timestamp, wave, db_file and respondent.
+
+    since_id only applies to the store and limits the read to submissions
+    appended after that id, which is how dashboard refreshes pick up new rows.
+
+    db_file is the database's absolute path, so two stores with the same file
+    name in different folders never share respondent ids.
+    """
+    db_file = os.path.abspath(path)
+    conn = sqlite3.connect(path)
+    try:
+        if is_store(conn):
+            conditions = []
+            params = []
+            if wave:
+                conditions.append("s.wave = ?")
+                params.append(wave)
+            if since_id is not None:
+                conditions.append("s.submission_id > ?")
+                params.append(since_id)
+            where = " WHERE " + " AND ".join(conditions) if conditions else ""
+
+            users_df = pd.read_sql_query(
+                "SELECT s.submission_id, s.name, s.email, s.department, s.timestamp, s.wave "
+                "FROM submissions s" + where,
+                conn, params=params
+            )
+            responses_df = pd.read_sql_query(
+                "SELECT r.submission_id, r.question_id, r.category, r.response "
+                "FROM responses r JOIN submissions s ON s.submission_id = r.submission_id" + where,
+                conn, params=params
+            )
+
+            users_df['respondent'] = db_file + ':' + users_df['submission_id'].astype(str)
+            responses_df['respondent'] = db_file + ':' + responses_df['submission_id'].astype(str)
+        else:
+            responses_df = pd.read_sql_query("SELECT * FROM responses", conn)
+            users_df = pd.read_sql_query("SELECT * FROM user_info", conn)
+            users_df['wave'] = users_df['timestamp'].map(wave_for_timestamp)
+
+            if wave:
+                if not (users_df['wave'] == wave).any():
+                    users_df = users_df.iloc[0:0]
+                    responses_df = responses_df.iloc[0:0]
+
+            users_df['respondent'] = db_file
+            responses_df['respondent'] = db_file
+    finally:
+        conn.close()
+
+    responses_df['db_file'] = db_file
+    users_df['db_file'] = db_file
+    return responses_df, users_df
+
+
+def import_legacy_db(conn, legacy_path):
+    """
+    Copy a legacy <name>_<timestamp>.db file into the store, inside a write
+    transaction the caller holds (see insert_submissions).
+
+    Returns:
+    the new submission id
+    """
+    legacy = sqlite3.connect(legacy_path)
+    try:
+        user = legacy.execute("SELECT name, email, department, timestamp FROM user_info").fetchone()
+        responses = legacy.execute("SELECT question_id, category, response FROM responses").fetchall()
+    finally:
+        legacy.close()
+
+    if user is None:
+        raise ValueError(f"No user_info row in {legacy_path}")
+
+    name, email, department, timestamp = user
+    return insert_submissions(conn, [{
+        'name': name,
+        'email': email,
+        'department': department,
+        'timestamp': timestamp,
+        'responses': responses,
+    }])[0]
@@ -0,0 +1,132 @@
+import os
+import pandas as pd
+import response_cube
+import survey_loader
+
+
+def file_signature(path):
+    """(size, mtime) of a database, including its WAL file when present"""
+    signature = []
+    for part in (path, path + "-wal"):
+        if os.path.exists(part):
+            stat = os.stat(part)
+            signature.extend([stat.st_size, stat.st_mtime_ns])
+    return tuple(signature)
+
+
+class SurveyDataset:
+    """
+    Loaded survey responses plus their aggregate cube, refreshed incrementally.
+
+    Every ingested database is remembered by path and (size, mtime). A refresh
+    only reads files that are new or have changed since, and from the response
+    store only the submissions appended after the last one read. Rows from
+    changed or deselected legacy files are dropped and their counts taken out
+    of the cube, new rows are appended and their counts added in.
+    """
+    def __init__(self, question_ids):
+        self.question_ids = question_ids
+        self.responses_df = None
+        self.users_df = None
+        self.cube = None
+        # Bumped whenever the loaded rows change, so cached renders can be keyed on it
+        self.version = 0
+        # path -> (signature, last submission id read, or None for legacy files)
+        self.ingested = {}
+
+    def refresh(self, files, progress=None):
+        """
+        Bring the dataset in line with files.
+
+        Returns:
+        (number of files read, errors) where errors is a list of (file, exception)
+        """
+        # Rows are tagged with the absolute path, so files that share a name stay apart
+        files = list(dict.fromkeys(os.path.abspath(path) for path in files))
+        stale = []
+        to_read = []
+        since_ids = {}
+
+        for path in list(self.ingested):
+            if path not in files:
+                stale.append(path)
+                del self.ingested[path]
+
+        signatures = {}
+        for path in files:
+            signatures[path] = file_signature(path)
+            previous = self.ingested.get(path)
+            if previous is None:
+                to_read.append(path)
+            elif previous[0] == signatures[path]:
+                continue
+            elif previous[1] is not None:
+                # The response store is append-only, so only read the new submissions
+                since_ids[path] = previous[1]
+                to_read.append(path)
+            else:
+                stale.append(path)
+                del self.ingested[path]
+                to_read.append(path)
+
+        self._drop(stale)
+
+        if not to_read:
+            return 0, []
+
+        responses_df, users_df, errors = survey_loader.load_survey_files(
+            to_read, progress=progress, since_ids=since_ids
+        )
+        failed = {file for file, _ in errors}
+
+        if users_df is not None and 'submission_id' in users_df.columns:
+            last_ids = users_df.groupby('db_file')['submission_id'].max()
+        else:
+            last_ids = pd.Series(dtype='int64')
+
+        for path in to_read:
+            if path in failed:
+                continue
+            last_id = last_ids.get(path)
+            if last_id is None or pd.isna(last_id):
+                last_id = since_ids.get(path)
+            self.ingested[path] = (signatures[path], None if last_id is None else int(last_id))
+
+        if responses_df is not None:
+            self._append(responses_df, users_df)
+
+        return len(to_read) - len(failed), errors
+
+    def _drop(self, paths):
+        """Remove the rows of the given files and take their counts out of the cube"""
+        if not paths or self.responses_df is None:
+            return
+
+        dropped = self.responses_df['db_file'].isin(paths)
+        dropped_users = self.users_df['db_file'].isin(paths)
+        if not dropped.any():
+            return
+
+        removed = response_cube.build_cube(self.responses_df[dropped], self.users_df[dropped_users])
+        self.cube = self.cube.subtract(removed)
+        self.responses_df = self.responses_df[~dropped].reset_index(drop=True)
+        self.users_df = self.users_df[~dropped_users].reset_index(drop=True)
+        self.version += 1
+
+    def _append(self, responses_df, users_df):
+        """Encode new rows, append them and add their counts to the cube"""
+        encoded = response_cube.encode_responses(responses_df, self.question_ids)
+        if encoded.empty:
+            # Nothing new to count, e.g. a store refreshed with no new submissions
+            return
+        added = response_cube.build_cube(encoded, users_df)
+
+        if self.responses_df is None:
+            self.responses_df = encoded
+            self.users_df = users_df
+            self.cube = added
+        else:
+            self.responses_df = response_cube.concat_encoded([self.responses_df, encoded])
+            self.users_df = pd.concat([self.users_df, users_df], ignore_index=True)
+            self.cube = self.cube.add(added)
+        self.version += 1
@@ -0,0 +1,133 @@
+from collections import OrderedDict
+from functools import cached_property
+import numpy as np
+import pandas as pd
+
+# Columns the dashboard filters on, in the order filters are applied
+FILTER_COLUMNS = ('Year-Month', 'Section', 'Question')
+
+
+class FilterIndex:
+    """
+    Row positions of the survey data for every Section, Question and
+    Year-Month value, built once per load.
+
+    A filter combination is answered by intersecting the sorted position
+    arrays of its values instead of masking (and copying) the whole frame,
+    and the last few combinations are memoized. Frames returned by frame()
+    are shared between callers and must not be modified in place.
+    """
+    def __init__(self, data, cache_size=8):
+        self.data = data
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        # column -> {value: sorted row positions}
+        self.positions = {
+            column: data.groupby(column, sort=False).indices
+            for column in FILTER_COLUMNS if column in data.columns
+        }
+
+    def rows(self, period=None, section=None, question=None):
+        """
+        Row positions matching the given values, or None when nothing is
+        filtered and every row matches. Filters on columns the data doesn't
+        have are ignored.
+        """
+        result = None
+        for column, value in zip(FILTER_COLUMNS, (period, section, question)):
+            if value is None or column not in self.positions:
+                continue
+            matches = self.positions[column].get(value, np.empty(0, dtype=np.intp))
+            result = matches if result is None else np.intersect1d(result, matches, assume_unique=True)
+        return result
+
+    def summary(self, period=None, section=None, question=None):
+        """SelectionSummary of the rows matching the given values, memoized per combination"""
+        key = (period, section, question)
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            return self.cache[key]
+
+        positions = self.rows(period, section, question)
+        # With no filters the data itself is used rather than a copy of it
+        df = self.data if positions is None else self.data.take(positions)
+
+        summary = SelectionSummary(df)
+        self.cache[key] = summary
+        while len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return summary
+
+    def values(self, column, where_column, where_value):
+        """Distinct values of column among the rows where where_column == where_value"""
+        positions = self.positions[where_column].get(where_value, np.empty(0, dtype=np.intp))
+        return self.data[column].take(positions).unique()
+
+
+class SelectionSummary:
+    """
+    Aggregates of one filtered selection, shared by the chart and the
+    statistics panel.
+
+    Every aggregate is computed on first use and then kept, so switching
+    chart type, toggling labels or showing the statistics again only reads
+    what an earlier view already computed.
+    """
+    def __init__(self, data):
+        self.data = data
+        # Rendered statistics panels, keyed by (level, section, question)
+        self.stats_html = {}
+        self._crosstabs = {}
+
+    @property
+    def empty(self):
+        return self.data.empty
+
+    @cached_property
+    def response_column(self):
+        """Column holding the chosen answer"""
+        return 'Selected Text' if 'Selected Text' in self.data.columns else 'Selected Option'
+
+    @cached_property
+    def section_counts(self):
+        return self.data.groupby('Section').size()
+
+    @cached_property
+    def question_counts(self):
+        return self.data.groupby('Question').size()
+
+    @cached_property
+    def response_counts(self):
+        if 'Selected Text' in self.data.columns:
+            return self.data['Selected Text'].value_counts()
+        return self.data.groupby('Selected Option').size()
+
+    @cached_property
+    def respondent_count(self):
+        return self.data['Source File'].nunique()
+
+    @cached_property
+    def question_total(self):
+        return self.data['Question'].nunique()
+
+    @cached_property
+    def section_total(self):
+        return self.data['Section'].nunique()
+
+    @cached_property
+    def month_pivot(self):
+        """Responses per YYYY-MM and answer, for stacked bars"""
+        months = pd.to_datetime(self.data['Timestamp']).dt.strftime('%Y-%m').rename('month')
+        return self.data.pivot_table(
+            index=months,
+            columns='Selected Text',
+            values='Source File',
+            aggfunc='count',
+            fill_value=0
+        )
+
+    def crosstab(self, row_column):
+        """Responses per row_column value and answer, for heatmaps"""
+        if row_column not in self._crosstabs:
+            self._crosstabs[row_column] = pd.crosstab(self.data[row_column], self.data[self.response_column])
+        return self._crosstabs[row_column]
@@ -0,0 +1,71 @@
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+import response_store
+
+
+class LoadCancelled(Exception):
+    """Raised when the progress callback asks the loader to stop"""
+
+
+def load_survey_files(files, progress=None, max_workers=4, chunk_size=32, since_ids=None):
+    """
+    Read many survey databases on a thread pool.
+
+    Files are submitted in bounded chunks so only chunk_size reads are in
+    flight at a time, and each finished chunk is folded into a single frame
+    before the next one starts, so the per-file frames never pile up.
+
+    Parameters:
+    files (list): paths of store or legacy per-respondent databases
+    progress (callable): called as progress(done, total) after every file;
+        returning False cancels the load and raises LoadCancelled
+    max_workers (int): number of reader threads
+    chunk_size (int): files read per chunk
+    since_ids (dict): path -> last submission id already read from a response store
+
+    Returns:
+    (responses_df, users_df, errors) where errors is a list of (file, exception)
+    and the frames are None if nothing could be read
+    """
+    since_ids = since_ids or {}
+    response_chunks = []
+    user_chunks = []
+    errors = []
+    total = len(files)
+    done = 0
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for start in range(0, total, chunk_size):
+            chunk = files[start:start + chunk_size]
+            futures = [
+                pool.submit(response_store.read_survey_db, file, since_id=since_ids.get(file))
+                for file in chunk
+            ]
+
+            chunk_responses = []
+            chunk_users = []
+            for file, future in zip(chunk, futures):
+                try:
+                    responses_df, users_df = future.result()
+                    chunk_responses.append(responses_df)
+                    chunk_users.append(users_df)
+                except Exception as e:
+                    errors.append((file, e))
+
+                done += 1
+                if progress is not None and progress(done, total) is False:
+                    for pending in futures:
+                        pending.cancel()
+                    raise LoadCancelled()
+
+            # Fold the chunk so only one frame per chunk is kept around
+            if chunk_responses:
+                response_chunks.append(pd.concat(chunk_responses, ignore_index=True))
+                user_chunks.append(pd.concat(chunk_users, ignore_index=True))
+
+    if not response_chunks:
+        return None, None, errors
+
+    responses_df = pd.concat(response_chunks, ignore_index=True)
+    users_df = pd.concat(user_chunks, ignore_index=True)
+    return responses_df, users_df, errors
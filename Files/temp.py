@@ -2,8 +2,11 @@ import sys
 import pandas as pd
 from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                              QHBoxLayout, QLabel, QPushButton, QRadioButton, 
-                             QButtonGroup, QFileDialog, QMessageBox, QTabWidget)
+                             QButtonGroup, QFileDialog, QMessageBox, QTabWidget,
+                             QScrollArea)
 from PySide6.QtCore import Qt
+import lazy_questions
+import question_bank
 
 class SurveyApp(QMainWindow):
     def __init__(self):
@@ -34,21 +37,30 @@ class SurveyApp(QMainWindow):
         
         # Set up layouts for each tab
         self.tab_layouts = {}
+        self.scroll_areas = {}
         for section_name, tab in self.tabs.items():
             layout = QVBoxLayout(tab)
             
             # Add scrollable content area for questions
+            scroll_area = QScrollArea()
+            scroll_area.setWidgetResizable(True)
             content_widget = QWidget()
             content_layout = QVBoxLayout(content_widget)
-            layout.addWidget(content_widget)
+            scroll_area.setWidget(content_widget)
+            layout.addWidget(scroll_area)
             
             # Store the content layout for later adding questions
             self.tab_layouts[section_name] = content_layout
+            self.scroll_areas[section_name] = scroll_area
             
             # Add the tab to the tab widget with a capitalized name
             display_name = section_name.title()
             self.tab_widget.addTab(tab, display_name)
         
+        # Questions are built per tab as it is shown and scrolled
+        self.question_lists = {}
+        self.tab_widget.currentChanged.connect(self.show_tab)
+        
         # Submit button
         self.submit_button = QPushButton("Submit Survey")
         self.submit_button.clicked.connect(self.submit_survey)
@@ -72,8 +84,8 @@ class SurveyApp(QMainWindow):
             return
         
         try:
-            # Read Excel file
-            df = pd.read_excel(file_path)
+            # Read Excel file, reusing the cached parse if it hasn't changed
+            df = question_bank.read_workbook(file_path)
             
             # Validate required columns
             required_columns = ['Question', 'Option1', 'Option2', 'Option3', 'Option4', 'Section']
@@ -94,10 +106,9 @@ class SurveyApp(QMainWindow):
             self.questions = {section: [] for section in self.tabs.keys()}
             self.user_answers = {}
             
-            # Group questions by section
-            for section in self.tabs.keys():
-                section_questions = df[df['Section'].str.lower() == section].to_dict('records')
-                self.questions[section] = section_questions
+            # Group questions by section in one pass
+            for section, section_df in df.groupby('Section', sort=False):
+                self.questions[section] = section_df.to_dict('records')
             
             # Display questions in each tab
             self.display_questions()
@@ -113,7 +124,12 @@ class SurveyApp(QMainWindow):
             QMessageBox.critical(self, "Error", f"Failed to load questions: {str(e)}")
     
     def display_questions(self):
-        """Display questions in their respective tabs"""
+        """Set up each tab's questions; their widgets are built once the tab is shown"""
+        # Stop the previous question lists before their tabs are cleared
+        for question_list in self.question_lists.values():
+            question_list.stop()
+        self.question_lists = {}
+        
         # Clear all existing questions from tabs
         for section, layout in self.tab_layouts.items():
             # Remove all widgets from the layout
@@ -134,42 +150,54 @@ class SurveyApp(QMainWindow):
                 self.tab_layouts[section].addWidget(label)
                 continue
             
-            # Add questions to this section
-            for q_idx, question_data in enumerate(questions):
-                # Create a container for this question
-                question_widget = QWidget()
-                question_layout = QVBoxLayout(question_widget)
-                
-                # Add the question text
-                question_label = QLabel(f"Q{q_idx+1}: {question_data['Question']}")
-                question_label.setWordWrap(True)
-                question_layout.addWidget(question_label)
-                
-                # Create button group for this question
-                question_id = f"{section}_{q_idx}"
-                button_group = QButtonGroup(self)
-                self.option_groups[question_id] = button_group
-                
-                # Add options as radio buttons
-                for i in range(1, 5):
-                    option_key = f'Option{i}'
-                    radio_button = QRadioButton(question_data[option_key])
-                    button_group.addButton(radio_button, i)
-                    question_layout.addWidget(radio_button)
-                
-                # Connect button group to save answer
-                button_group.buttonClicked.connect(
-                    lambda btn, qid=question_id: self.save_answer(qid, btn)
-                )
-                
-                # Add some spacing between questions
-                question_layout.addSpacing(20)
-                
-                # Add this question to the tab
-                self.tab_layouts[section].addWidget(question_widget)
+            self.question_lists[section] = lazy_questions.LazyQuestionList(
+                self.scroll_areas[section], self.tab_layouts[section], questions,
+                lambda q_idx, question_data, section=section: self.build_question(section, q_idx, question_data)
+            )
             
             # Add stretch to push questions to the top
             self.tab_layouts[section].addStretch()
+        
+        self.show_tab(self.tab_widget.currentIndex())
+    
+    def show_tab(self, index):
+        """Start building a tab's questions the first time it is shown"""
+        sections = list(self.tabs.keys())
+        if 0 <= index < len(sections) and sections[index] in self.question_lists:
+            self.question_lists[sections[index]].start()
+    
+    def build_question(self, section, q_idx, question_data):
+        """Create the widget for one question"""
+        # Create a container for this question
+        question_widget = QWidget()
+        question_layout = QVBoxLayout(question_widget)
+        
+        # Add the question text
+        question_label = QLabel(f"Q{q_idx+1}: {question_data['Question']}")
+        question_label.setWordWrap(True)
+        question_layout.addWidget(question_label)
+        
+        # Create button group for this question
+        question_id = f"{section}_{q_idx}"
+        button_group = QButtonGroup(self)
+        self.option_groups[question_id] = button_group
+        
+        # Add options as radio buttons
+        for i in range(1, 5):
+            option_key = f'Option{i}'
+            radio_button = QRadioButton(question_data[option_key])
+            button_group.addButton(radio_button, i)
+            question_layout.addWidget(radio_button)
+        
+        # Connect button group to save answer
+        button_group.buttonClicked.connect(
+            lambda btn, qid=question_id: self.save_answer(qid, btn)
+        )
+        
+        # Add some spacing between questions
+        question_layout.addSpacing(20)
+        
+        return question_widget
     
     def save_answer(self, question_id, button):
         """Save the user's answer for a question"""
@@ -283,7 +311,8 @@ if __name__ == "__main__":
         try:
             from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                                         QHBoxLayout, QLabel, QPushButton, QRadioButton, 
-                                        QButtonGroup, QFileDialog, QMessageBox, QTabWidget)
+                                        QButtonGroup, QFileDialog, QMessageBox, QTabWidget,
+                                        QScrollArea)
             from PyQt6.QtCore import Qt
             
             app = QApplication(sys.argv)
@@ -1,5 +1,4 @@
 import sys
-import os
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
@@ -13,6 +12,9 @@ from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                              QGroupBox, QCheckBox, QSplitter, QFrame)
 from PySide6.QtCore import Qt, Signal, Slot
 from PySide6.QtGui import QFont, QColor
+import excel_cache
+import survey_filter
+import trend_index
 
 # Set style for plots
 plt.style.use('ggplot')
@@ -125,6 +127,14 @@ class SurveyDashboard(QMainWindow):
         filter_layout.addWidget(QLabel("Time Period:"))
         filter_layout.addWidget(self.time_period_combo)
         
+        # Bucket size for trend (line) charts
+        self.trend_combo = QComboBox()
+        self.trend_combo.addItems(list(trend_index.TREND_FREQUENCIES))
+        self.trend_combo.setCurrentText("Monthly")
+        self.trend_combo.currentIndexChanged.connect(self.update_chart)
+        filter_layout.addWidget(QLabel("Trend Granularity:"))
+        filter_layout.addWidget(self.trend_combo)
+        
         # Summary statistics option
         self.show_stats_check = QCheckBox("Show Summary Statistics")
         self.show_stats_check.setChecked(True)
@@ -197,6 +207,8 @@ class SurveyDashboard(QMainWindow):
         
         # Initialize data structures
         self.survey_data = pd.DataFrame()
+        self.filter_index = None
+        self.trend_index = trend_index.TrendIndex()
         self.sections = []
         self.questions = {}
         self.current_level = "Overall Analysis"
@@ -224,43 +236,16 @@ class SurveyDashboard(QMainWindow):
             return
         
         try:
-            # Find all Excel files in the folder
-            excel_files = [f for f in os.listdir(folder_path) 
-                         if f.endswith('.xlsx') or f.endswith('.xls')]
+            # Parse the workbooks on a process pool, reusing cached sidecars for unchanged files
+            excel_files, all_data, errors, digests = excel_cache.load_excel_folder(folder_path)
             
             if not excel_files:
                 QMessageBox.warning(self, "No Files Found", 
                                   "No Excel files found in the selected folder.")
                 return
             
-            # Load and concatenate all Excel files
-            all_data = []
-            
-            for file in excel_files:
-                file_path = os.path.join(folder_path, file)
-                try:
-                    # Extract timestamp from filename if possible (for time filtering)
-                    timestamp = None
-                    try:
-                        # Try to extract date from filename (assuming format like survey_YYYY-MM-DD.xlsx)
-                        filename = os.path.basename(file)
-                        date_part = filename.split('_')[-1].split('.')[0]
-                        timestamp = pd.to_datetime(date_part)
-                    except:
-                        # If can't extract, use file modification time
-                        mod_time = os.path.getmtime(file_path)
-                        timestamp = pd.to_datetime(mod_time, unit='s')
-                    
-                    # Read the Excel file
-                    df = pd.read_excel(file_path)
-                    
-                    # Add file metadata
-                    df['Source File'] = file
-                    df['Timestamp'] = timestamp
-                    
-                    all_data.append(df)
-                except Exception as e:
-                    print(f"Error loading {file}: {str(e)}")
+            for file, e in errors:
+                print(f"Error loading {file}: {str(e)}")
             
             if not all_data:
                 QMessageBox.warning(self, "Loading Error", 
@@ -270,6 +255,9 @@ class SurveyDashboard(QMainWindow):
             # Combine all data
             self.survey_data = pd.concat(all_data, ignore_index=True)
             
+            # Only new or changed files are counted into the trend buckets
+            self.trend_index.sync(all_data, digests)
+            
             # Update UI with available sections and questions
             self.update_filters()
             
@@ -289,25 +277,31 @@ class SurveyDashboard(QMainWindow):
         if self.survey_data.empty:
             return
         
+        # Derive the time periods first so they are part of the filter index
+        if 'Timestamp' in self.survey_data.columns:
+            self.survey_data['Year-Month'] = self.survey_data['Timestamp'].dt.strftime('%Y-%m')
+        
+        # Index the rows once; the combo updates below already trigger filtering
+        self.filter_index = survey_filter.FilterIndex(self.survey_data)
+        
         # Get unique sections
         self.sections = sorted(self.survey_data['Section'].unique())
         
-        # Update section dropdown
-        self.section_combo.clear()
-        self.section_combo.addItems(self.sections)
-        
         # Get questions for each section
         self.questions = {}
         for section in self.sections:
-            section_questions = self.survey_data[self.survey_data['Section'] == section]['Question'].unique()
+            section_questions = self.filter_index.values('Question', 'Section', section)
             self.questions[section] = sorted(section_questions)
         
+        # Update section dropdown
+        self.section_combo.clear()
+        self.section_combo.addItems(self.sections)
+        
         # Update question list for initial section
         self.update_question_list(self.sections[0] if self.sections else "")
         
         # Update time periods if available
-        if 'Timestamp' in self.survey_data.columns:
-            self.survey_data['Year-Month'] = self.survey_data['Timestamp'].dt.strftime('%Y-%m')
+        if 'Year-Month' in self.survey_data.columns:
             time_periods = sorted(self.survey_data['Year-Month'].unique())
             
             self.time_period_combo.clear()
@@ -370,122 +364,96 @@ class SurveyDashboard(QMainWindow):
             self.stats_label.setText("No data loaded yet")
             return
         
-        # Filter data based on current selections
-        filtered_data = self.get_filtered_data()
+        # Aggregates for the current selections, shared with the chart
+        summary = self.get_summary()
         
-        if filtered_data.empty:
+        if summary.empty:
             self.stats_label.setText("No data available for the selected filters")
             return
         
-        # Generate statistics based on analysis level
-        stats_text = ""
+        # The panel only depends on the selection, so it is built once per selection
+        key = (self.current_level, self.current_section, self.current_question)
+        if key not in summary.stats_html:
+            summary.stats_html[key] = self.build_statistics_html(summary)
+        self.stats_label.setText(summary.stats_html[key])
+    
+    def build_statistics_html(self, summary):
+        """Render the statistics panel for a selection summary"""
+        parts = []
+        
+        def add_table(header, rows, total):
+            parts.append("<table border='1' cellpadding='5'>")
+            parts.append(f"<tr><th>{header}</th><th>Count</th><th>Percentage</th></tr>")
+            parts.extend(
+                f"<tr><td>{label}</td><td>{count}</td><td>{count / total * 100:.1f}%</td></tr>"
+                for label, count in rows.items()
+            )
+            parts.append("</table>")
         
+        # Generate statistics based on analysis level
         if self.current_level == "Overall Analysis":
             # Overall response statistics
-            total_responses = len(filtered_data['Source File'].unique())
-            total_questions = filtered_data['Question'].nunique()
-            total_sections = filtered_data['Section'].nunique()
+            parts.append("<h3>Overall Survey Statistics</h3>")
+            parts.append(f"<p>Total Survey Responses: {summary.respondent_count}</p>")
+            parts.append(f"<p>Number of Sections: {summary.section_total}</p>")
+            parts.append(f"<p>Number of Questions: {summary.question_total}</p>")
             
             # Response rates by section
-            section_counts = filtered_data.groupby('Section').size()
-            section_percents = section_counts / section_counts.sum() * 100
-            
-            stats_text += f"<h3>Overall Survey Statistics</h3>"
-            stats_text += f"<p>Total Survey Responses: {total_responses}</p>"
-            stats_text += f"<p>Number of Sections: {total_sections}</p>"
-            stats_text += f"<p>Number of Questions: {total_questions}</p>"
-            
-            stats_text += f"<h4>Response Distribution by Section</h4>"
-            stats_text += "<table border='1' cellpadding='5'>"
-            stats_text += "<tr><th>Section</th><th>Count</th><th>Percentage</th></tr>"
-            
-            for section, count in section_counts.items():
-                percent = section_percents[section]
-                stats_text += f"<tr><td>{section}</td><td>{count}</td><td>{percent:.1f}%</td></tr>"
-            
-            stats_text += "</table>"
+            parts.append("<h4>Response Distribution by Section</h4>")
+            add_table("Section", summary.section_counts, summary.section_counts.sum())
             
         elif self.current_level == "Section Level Analysis":
             # Section level statistics
-            section = self.current_section
-            section_data = filtered_data[filtered_data['Section'] == section]
-            
-            total_questions = section_data['Question'].nunique()
-            response_counts = section_data.groupby(['Question', 'Selected Text']).size().unstack()
-            
-            stats_text += f"<h3>Section Analysis: {section}</h3>"
-            stats_text += f"<p>Number of Questions: {total_questions}</p>"
+            parts.append(f"<h3>Section Analysis: {self.current_section}</h3>")
+            parts.append(f"<p>Number of Questions: {summary.question_total}</p>")
             
             # Top response patterns
-            if 'Selected Text' in section_data.columns:
-                option_counts = section_data['Selected Text'].value_counts()
-                stats_text += f"<h4>Top Responses</h4>"
-                stats_text += "<table border='1' cellpadding='5'>"
-                stats_text += "<tr><th>Response</th><th>Count</th><th>Percentage</th></tr>"
-                
-                for option, count in option_counts.head(5).items():
-                    percent = count / len(section_data) * 100
-                    stats_text += f"<tr><td>{option}</td><td>{count}</td><td>{percent:.1f}%</td></tr>"
-                
-                stats_text += "</table>"
+            if 'Selected Text' in summary.data.columns:
+                parts.append("<h4>Top Responses</h4>")
+                add_table("Response", summary.response_counts.head(5), len(summary.data))
             
         else:  # Question Level Analysis
             # Question level statistics
-            section = self.current_section
-            question = self.current_question
-            
-            question_data = filtered_data[
-                (filtered_data['Section'] == section) & 
-                (filtered_data['Question'] == question)
-            ]
-            
-            stats_text += f"<h3>Question Analysis</h3>"
-            stats_text += f"<p>Section: {section}</p>"
-            stats_text += f"<p>Question: {question}</p>"
+            parts.append("<h3>Question Analysis</h3>")
+            parts.append(f"<p>Section: {self.current_section}</p>")
+            parts.append(f"<p>Question: {self.current_question}</p>")
             
             # Response distribution
-            if 'Selected Text' in question_data.columns:
-                option_counts = question_data['Selected Text'].value_counts()
-                total_responses = len(question_data)
-                
-                stats_text += f"<h4>Response Distribution</h4>"
-                stats_text += f"<p>Total Responses: {total_responses}</p>"
-                stats_text += "<table border='1' cellpadding='5'>"
-                stats_text += "<tr><th>Response</th><th>Count</th><th>Percentage</th></tr>"
-                
-                for option, count in option_counts.items():
-                    percent = count / total_responses * 100
-                    stats_text += f"<tr><td>{option}</td><td>{count}</td><td>{percent:.1f}%</td></tr>"
-                
-                stats_text += "</table>"
+            if 'Selected Text' in summary.data.columns:
+                total_responses = len(summary.data)
+                parts.append("<h4>Response Distribution</h4>")
+                parts.append(f"<p>Total Responses: {total_responses}</p>")
+                add_table("Response", summary.response_counts, total_responses)
         
-        self.stats_label.setText(stats_text)
+        return "".join(parts)
     
-    def get_filtered_data(self):
-        """Get data filtered according to current selections"""
-        if self.survey_data.empty:
-            return pd.DataFrame()
+    def get_summary(self):
+        """
+        Get the aggregates of the data filtered according to current selections.
         
-        filtered_data = self.survey_data.copy()
+        Summaries come from the filter index and are shared between the chart,
+        the statistics panel and later calls with the same selections, so
+        neither they nor their data may be modified in place.
+        """
+        if self.survey_data.empty or self.filter_index is None:
+            return survey_filter.SelectionSummary(pd.DataFrame())
         
         # Apply time period filter if selected
         time_period = self.time_period_combo.currentText()
-        if time_period != "All Time" and 'Year-Month' in filtered_data.columns:
-            filtered_data = filtered_data[filtered_data['Year-Month'] == time_period]
+        period = time_period if time_period != "All Time" else None
         
         # Filter based on analysis level
+        section = None
+        question = None
         if self.current_level == "Section Level Analysis":
-            if self.current_section:
-                filtered_data = filtered_data[filtered_data['Section'] == self.current_section]
+            section = self.current_section or None
         
         elif self.current_level == "Question Level Analysis":
             if self.current_section and self.current_question:
-                filtered_data = filtered_data[
-                    (filtered_data['Section'] == self.current_section) & 
-                    (filtered_data['Question'] == self.current_question)
-                ]
+                section = self.current_section
+                question = self.current_question
         
-        return filtered_data
+        return self.filter_index.summary(period, section, question)
     
     def update_chart(self):
         """Update the chart based on current selections"""
@@ -493,10 +461,11 @@ class SurveyDashboard(QMainWindow):
             self.setup_empty_chart()
             return
         
-        # Get filtered data
-        filtered_data = self.get_filtered_data()
+        # Get filtered data and its aggregates
+        summary = self.get_summary()
+        filtered_data = summary.data
         
-        if filtered_data.empty:
+        if summary.empty:
             self.chart_canvas.axes.clear()
             self.chart_canvas.axes.text(0.5, 0.5, "No data available for the selected filters",
                                        horizontalalignment='center', verticalalignment='center',
@@ -511,22 +480,18 @@ class SurveyDashboard(QMainWindow):
         # Prepare data based on analysis level
         if self.current_level == "Overall Analysis":
             # For overall, show section distribution
-            plot_data = filtered_data.groupby('Section').size()
+            plot_data = summary.section_counts
             title = "Overall Response Distribution by Section"
             
         elif self.current_level == "Section Level Analysis":
             # For section level, show question distribution
-            plot_data = filtered_data.groupby('Question').size()
+            plot_data = summary.question_counts
             title = f"Response Count by Question in {self.current_section} Section"
             
         else:  # Question Level Analysis
             # For question level, show response distribution
-            if 'Selected Text' in filtered_data.columns:
-                plot_data = filtered_data['Selected Text'].value_counts()
-                title = f"Response Distribution for: {self.current_question}"
-            else:
-                plot_data = filtered_data.groupby('Selected Option').size()
-                title = f"Response Distribution for: {self.current_question}"
+            plot_data = summary.response_counts
+            title = f"Response Distribution for: {self.current_question}"
         
         # Convert to percentages if needed
         show_percent = self.show_percent_check.isChecked()
@@ -588,10 +553,23 @@ class SurveyDashboard(QMainWindow):
         elif chart_type == "Line Chart":
             # For line chart, we need time dimension
             if self.current_level == "Question Level Analysis" and 'Timestamp' in filtered_data.columns:
-                # Group by time and option
-                time_series = filtered_data.groupby([
-                    pd.Grouper(key='Timestamp', freq='M'), 'Selected Text'
-                ]).size().unstack()
+                # Group by time and option, rolled up from the pre-bucketed daily counts
+                time_period = self.time_period_combo.currentText()
+                time_series = self.trend_index.counts(
+                    self.current_section, self.current_question,
+                    trend_index.TREND_FREQUENCIES[self.trend_combo.currentText()],
+                    time_period if time_period != "All Time" else None
+                )
+                
+                if time_series.empty:
+                    # Nothing of this question falls in the selected period
+                    self.chart_canvas.axes.clear()
+                    self.chart_canvas.axes.text(0.5, 0.5, "No data available for the selected filters",
+                                               horizontalalignment='center', verticalalignment='center',
+                                               fontsize=12)
+                    self.chart_canvas.axes.axis('off')
+                    self.chart_canvas.draw()
+                    return
                 
                 # Plot each option as a line
                 time_series.plot(ax=self.chart_canvas.axes, marker='o')
@@ -625,17 +603,8 @@ class SurveyDashboard(QMainWindow):
         elif chart_type == "Stacked Bar Chart":
             # This works best for question level analysis with time dimension
             if 'Timestamp' in filtered_data.columns:
-                # Group by time period (month)
-                filtered_data['month'] = pd.to_datetime(filtered_data['Timestamp']).dt.strftime('%Y-%m')
-                
                 # Group by month and response
-                pivot_data = filtered_data.pivot_table(
-                    index='month', 
-                    columns='Selected Text', 
-                    values='Source File', 
-                    aggfunc='count', 
-                    fill_value=0
-                )
+                pivot_data = summary.month_pivot
                 
                 # Plot stacked bar
                 pivot_data.plot(kind='bar', stacked=True, ax=self.chart_canvas.axes)
@@ -661,18 +630,10 @@ class SurveyDashboard(QMainWindow):
                 # Create a pivot table of responses by question and option
                 if self.current_level == "Overall Analysis":
                     # Group by section and response
-                    heatmap_data = pd.crosstab(
-                        filtered_data['Section'], 
-                        filtered_data['Selected Text'] if 'Selected Text' in filtered_data.columns 
-                        else filtered_data['Selected Option']
-                    )
+                    heatmap_data = summary.crosstab('Section')
                 else:
                     # Group by question and response
-                    heatmap_data = pd.crosstab(
-                        filtered_data['Question'], 
-                        filtered_data['Selected Text'] if 'Selected Text' in filtered_data.columns 
-                        else filtered_data['Selected Option']
-                    )
+                    heatmap_data = summary.crosstab('Question')
                 
                 # Calculate percentages by row
                 if show_percent:
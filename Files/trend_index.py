@@ -0,0 +1,98 @@
+import pandas as pd
+
+# Granularities offered for trend charts, as pandas period aliases
+TREND_FREQUENCIES = {
+    "Weekly": "W",
+    "Monthly": "M",
+    "Quarterly": "Q",
+}
+
+INDEX_COLUMNS = ['Section', 'Question', 'Selected Text']
+
+
+def daily_counts(df):
+    """Responses per section, question, answer and day for one results file"""
+    days = pd.to_datetime(df['Timestamp']).dt.normalize().rename('Day')
+    return df.groupby([df[column] for column in INDEX_COLUMNS] + [days]).size()
+
+
+class TrendIndex:
+    """
+    Response counts per question and answer, bucketed by day and kept
+    up to date as results files are loaded.
+
+    Every file contributes its own daily counts, so a reload only counts the
+    files that are new or whose contents changed and takes out the ones that
+    are gone. Weekly, monthly and quarterly trends are rolled up from the
+    daily buckets instead of re-scanning the response rows.
+    """
+    def __init__(self):
+        # file -> ((content digest, file timestamp), daily counts)
+        self.files = {}
+        self.daily = pd.Series(dtype='int64')
+        self.cache = {}
+
+    def sync(self, frames, digests):
+        """
+        Bring the index in line with the loaded files.
+
+        Parameters:
+        frames (list): one DataFrame per results file, with 'Source File' and 'Timestamp'
+        digests (dict): file -> content digest, used to spot changed files
+        """
+        loaded = {df['Source File'].iloc[0]: df for df in frames if not df.empty}
+        # A file's rows move in time when its timestamp changes, even if its contents don't
+        versions = {file: (digests.get(file), df['Timestamp'].iloc[0]) for file, df in loaded.items()}
+        changed = False
+
+        for file in list(self.files):
+            if self.files[file][0] != versions.get(file):
+                _, counts = self.files.pop(file)
+                self.daily = self.daily.sub(counts, fill_value=0)
+                changed = True
+
+        for file, df in loaded.items():
+            if file in self.files or not set(INDEX_COLUMNS).issubset(df.columns):
+                continue
+            counts = daily_counts(df)
+            self.files[file] = (versions[file], counts)
+            self.daily = counts if self.daily.empty else self.daily.add(counts, fill_value=0)
+            changed = True
+
+        if changed:
+            self.daily = self.daily[self.daily > 0].astype('int64')
+            self.cache = {}
+
+    def counts(self, section, question, freq="M", period=None):
+        """
+        Responses per time bucket and answer for one question.
+
+        Parameters:
+        freq (str): pandas period alias, see TREND_FREQUENCIES
+        period (str): optional YYYY-MM month to restrict the trend to
+
+        Returns:
+        DataFrame indexed by bucket start time with one column per answer
+        """
+        key = (section, question, freq, period)
+        if key in self.cache:
+            return self.cache[key]
+
+        try:
+            by_day = self.daily.xs((section, question), level=['Section', 'Question'])
+        except (KeyError, TypeError):
+            # Not answered in any file, or nothing indexed yet (daily has no levels then)
+            by_day = pd.Series(dtype='int64')
+
+        if by_day.empty:
+            trend = pd.DataFrame()
+        else:
+            trend = by_day.unstack('Selected Text', fill_value=0)
+            if period is not None:
+                trend = trend[trend.index.strftime('%Y-%m') == period]
+            buckets = trend.index.to_period(freq)
+            trend = trend.groupby(buckets).sum()
+            trend.index = trend.index.to_timestamp()
+
+        self.cache[key] = trend
+        return trend
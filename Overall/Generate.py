@@ -2,6 +2,7 @@ import pandas as pd
 import random
 import string
 import os
+from credential_store import hashed_rows, migrate_workbook
 
 def generate_password(length=10):
     """Generate a random password with specified length."""
@@ -27,7 +28,11 @@ def generate_username(first_names, last_names):
     return random.choice(formats)
 
 def generate_credentials(num_users=10, output_file="login_details.xlsx"):
-    """Generate credentials for specified number of users and save to Excel."""
+    """Generate credentials for specified number of users and save to Excel.
+
+    Only a salt and PBKDF2 hash of each password are written; the passwords
+    themselves are printed once here and not stored.
+    """
     
     # Sample names for generating usernames
     first_names = [
@@ -49,21 +54,27 @@ def generate_credentials(num_users=10, output_file="login_details.xlsx"):
         password = generate_password()
         credentials.append({"username": username, "password": password})
     
-    # Create DataFrame and save to Excel
-    df = pd.DataFrame(credentials)
+    # Create DataFrame of salted hashes and save to Excel
+    rows = hashed_rows((cred["username"], cred["password"]) for cred in credentials)
+    df = pd.DataFrame(rows)
     df.to_excel(output_file, index=False)
     
     print(f"Generated {num_users} credentials and saved to {output_file}")
-    print("\nSample credentials:")
-    for i, cred in enumerate(credentials[:3], 1):
+    print("\nGenerated credentials:")
+    for i, cred in enumerate(credentials, 1):
         print(f"{i}. Username: {cred['username']}, Password: {cred['password']}")
-    print("...")
 
 if __name__ == "__main__":
-    # Number of user credentials to generate
-    num_users = int(input("Enter the number of users to generate (default 10): ") or 10)
-    
-    # Output file name
-    output_file = input("Enter output file name (default 'login_details.xlsx'): ") or "login_details.xlsx"
-    
-    generate_credentials(num_users, output_file)
\ No newline at end of file
+    # Workbooks from before password hashing can be converted in place
+    legacy_file = input("Plaintext workbook to migrate (leave empty to generate new users): ")
+    if legacy_file:
+        migrated = migrate_workbook(legacy_file)
+        print(f"Replaced the passwords of {migrated} users in {legacy_file} with salted hashes")
+    else:
+        # Number of user credentials to generate
+        num_users = int(input("Enter the number of users to generate (default 10): ") or 10)
+        
+        # Output file name
+        output_file = input("Enter output file name (default 'login_details.xlsx'): ") or "login_details.xlsx"
+        
+        generate_credentials(num_users, output_file)
@@ -13,12 +13,14 @@ from PySide6.QtGui import QDropEvent, QDragEnterEvent
 from PySide6.QtWidgets import QPlainTextEdit, QHeaderView
 from PySide6.QtGui import QDoubleValidator
 from io import StringIO  # Import StringIO for text conversion
+from credential_store import get_credential_store
 
 
 class LoginWindow(QWidget):
     def __init__(self, excel_path="login_details.xlsx"):
         super().__init__()
         self.excel_path = excel_path
+        self.credentials = get_credential_store(excel_path)
         self.init_ui()
         
     def init_ui(self):
@@ -50,15 +52,8 @@ class LoginWindow(QWidget):
         password = self.password_input.text()
         
         try:
-            # Read Excel file with login credentials
-            credentials_df = pd.read_excel(self.excel_path)
-            
-            # Check if credentials match
-            valid_login = False
-            for _, row in credentials_df.iterrows():
-                if row['username'] == username and row['password'] == password:
-                    valid_login = True
-                    break
+            # Credentials are loaded once and re-read only when the file changes
+            valid_login = self.credentials.verify(username, password)
             
             if valid_login:
                 self.hide()
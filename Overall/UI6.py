@@ -1,24 +1,31 @@
 import sys
 import os
-import pandas as pd
 import polars as pl
-from pathlib import Path
 from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QPushButton, 
                               QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, 
                               QStackedWidget, QFileDialog, QTableWidget, 
                               QDateEdit, QMessageBox, QTableWidgetItem, 
-                              QFormLayout, QDialog, QTabWidget, QGroupBox)
-from PySide6.QtCore import Qt, QDate
+                              QFormLayout, QDialog, QTabWidget, QGroupBox, QTableView)
+from PySide6 import QtCore
+from PySide6.QtCore import Qt, QDate, QThreadPool
 from PySide6.QtGui import QDropEvent, QDragEnterEvent
 from PySide6.QtWidgets import QPlainTextEdit, QHeaderView
 from PySide6.QtGui import QDoubleValidator
-from io import StringIO  # Import StringIO for text conversion
+from credential_store import get_credential_store
+from default_tables import get_default_tables
+from polars_table_model import table_model_class
+from pasted_tables import PastedTableParser
+from xipv_jobs import XIPVJob, parallel_job_limit, validate_entries
+
+# Table model for the default-table editors, on this app's Qt binding
+PolarsTableModel = table_model_class(QtCore)
 
 
 class LoginWindow(QWidget):
     def __init__(self, excel_path="login_details.xlsx"):
         super().__init__()
         self.excel_path = excel_path
+        self.credentials = get_credential_store(excel_path)
         self.init_ui()
         
     def init_ui(self):
@@ -50,15 +57,8 @@ class LoginWindow(QWidget):
         password = self.password_input.text()
         
         try:
-            # Read Excel file with login credentials
-            credentials_df = pd.read_excel(self.excel_path)
-            
-            # Check if credentials match
-            valid_login = False
-            for _, row in credentials_df.iterrows():
-                if row['username'] == username and row['password'] == password:
-                    valid_login = True
-                    break
+            # Credentials are loaded once and re-read only when the file changes
+            valid_login = self.credentials.verify(username, password)
             
             if valid_login:
                 self.hide()
@@ -200,6 +200,14 @@ class XIPVWindow(QMainWindow):
         self.init_ui()
         self.data_entries = {}
         self.default_data_path = "default_tables.xlsx"  # Path to default data Excel file
+        self.default_tables = get_default_tables(self.default_data_path)
+        # Processing runs here rather than on the GUI thread
+        self.thread_pool = QThreadPool()
+        self.thread_pool.setMaxThreadCount(parallel_job_limit())
+        self.jobs = {}  # input_table row -> running XIPVJob
+        self.row_entries = {}  # input_table row -> its data_entries, until processed
+        self.batch_rows = set()  # rows of the running batch still to report back
+        self.batch_counts = {}  # outcome -> number of batch rows
         
     def init_ui(self):
         self.setWindowTitle("XIPV")
@@ -219,7 +227,17 @@ class XIPVWindow(QMainWindow):
         
         # Process button
         self.process_button = QPushButton("Process Data")
-        self.process_button.clicked.connect(self.start_process_sequence)
+        self.process_button.clicked.connect(lambda: self.start_process_sequence())
+        
+        # Batch buttons: enter runs now, process them all together later
+        self.queue_button = QPushButton("Add to Batch")
+        self.queue_button.clicked.connect(lambda: self.start_process_sequence(queue_only=True))
+        self.run_pending_button = QPushButton("Run Pending")
+        self.run_pending_button.clicked.connect(self.run_pending_jobs)
+        
+        # Cancel button for the runs selected in the table
+        self.cancel_button = QPushButton("Cancel Selected")
+        self.cancel_button.clicked.connect(self.cancel_selected_jobs)
         
         # Table for displaying input data
         self.input_table = QTableWidget()
@@ -233,13 +251,17 @@ class XIPVWindow(QMainWindow):
         # Add widgets to layout
         main_layout.addWidget(title)
         main_layout.addWidget(self.process_button)
+        main_layout.addWidget(self.queue_button)
+        main_layout.addWidget(self.run_pending_button)
+        main_layout.addWidget(self.cancel_button)
         main_layout.addWidget(self.input_table)
     
-    def start_process_sequence(self):
+    def start_process_sequence(self, queue_only=False):
         # Reset data for new processing
         self.data_entries = {
             'file_info': {},
-            'tables': [None, None, None, None]  # Initialize with 4 None tables
+            'tables': [None, None, None, None],  # Initialize with 4 None tables
+            'queue_only': queue_only  # Leave the run pending for Run Pending
         }
         
         # Show first dialog for file path, date, and adjustments
@@ -278,10 +300,8 @@ class XIPVWindow(QMainWindow):
             table_data = dialog.table_data
             if table_data:
                 try:
-                    # Parse the clipboard data into pandas DataFrame
-                    pandas_df = pd.read_clipboard(sep='\t')
-                    # Convert to polars
-                    pl_df = pl.from_pandas(pandas_df)
+                    # Use the frame the dialog already parsed
+                    pl_df = dialog.table_frame
                     
                     # Store the polars DataFrame
                     self.data_entries['tables'][0] = pl_df
@@ -328,8 +348,12 @@ class XIPVWindow(QMainWindow):
                     QTableWidgetItem("4/4")
                 )
                 
-                # Process all data
-                self.process_data()
+                if self.data_entries['queue_only']:
+                    self.row_entries[self.current_row] = self.data_entries
+                    self.set_row_status(self.current_row, "Pending")
+                else:
+                    # Process all data
+                    self.process_data()
             else:
                 # Dialog cancelled, update status
                 self.input_table.setItem(self.current_row, 5, QTableWidgetItem("Cancelled"))
@@ -340,11 +364,10 @@ class XIPVWindow(QMainWindow):
     def load_default_tables(self):
         """Load default tables data from Excel file"""
         if os.path.exists(self.default_data_path):
-            # Load tables 2-4 from Excel sheets
+            # Load tables 2-4 from the cached workbook sheets
             for i in range(1, 4):  # Tables 2-4 (index 1-3)
                 try:
-                    pandas_df = pd.read_excel(self.default_data_path, sheet_name=f"Table{i+1}")
-                    self.data_entries['tables'][i] = pl.from_pandas(pandas_df)
+                    self.data_entries['tables'][i] = self.default_tables.table(f"Table{i+1}")
                 except Exception as e:
                     print(f"Error loading default table {i+1}: {str(e)}")
                     # Create empty table as fallback
@@ -355,80 +378,145 @@ class XIPVWindow(QMainWindow):
                 self.data_entries['tables'][i] = pl.DataFrame()
             
             # Create default Excel file with empty sheets
-            with pd.ExcelWriter(self.default_data_path) as writer:
-                for i in range(1, 5):  # Create 4 sheets
-                    pd.DataFrame().to_excel(writer, sheet_name=f"Table{i}", index=False)
+            self.default_tables.save({f"Table{i}": pl.DataFrame() for i in range(1, 5)})  # Create 4 sheets
     
     def save_default_tables(self, modified_indices):
         """Save modified default tables back to Excel"""
+        sheets = {}
         if not os.path.exists(self.default_data_path):
             # Create Excel file if it doesn't exist
-            with pd.ExcelWriter(self.default_data_path) as writer:
-                for i in range(4):
-                    pd.DataFrame().to_excel(writer, sheet_name=f"Table{i+1}", index=False)
+            sheets = {f"Table{i+1}": pl.DataFrame() for i in range(4)}
         
         # Only save tables that were modified
-        if modified_indices:
-            with pd.ExcelWriter(self.default_data_path, mode='a', if_sheet_exists='replace') as writer:
-                for i in modified_indices:
-                    if i > 0:  # Only save tables 2-4 (index 1-3)
-                        # Convert polars to pandas for Excel writing
-                        pandas_df = self.data_entries['tables'][i].to_pandas()
-                        pandas_df.to_excel(writer, sheet_name=f"Table{i+1}", index=False)
+        for i in modified_indices or []:
+            if i > 0:  # Only save tables 2-4 (index 1-3)
+                sheets[f"Table{i+1}"] = self.data_entries['tables'][i]
+        
+        if sheets:
+            saved = self.default_tables.save(sheets)
+            # Keep the tables in the dtypes they were saved with
+            for i in modified_indices or []:
+                if i > 0:
+                    self.data_entries['tables'][i] = saved[f"Table{i+1}"]
     
     def process_data(self):
+        """Check the entries and hand the run for the current row to the thread pool"""
         try:
-            # Load data from file
-            file_path = self.data_entries['file_info']['file_path']
-            date = self.data_entries['file_info']['date']
-            adjustment1 = float(self.data_entries['file_info']['adjustment1'])
-            adjustment2 = float(self.data_entries['file_info']['adjustment2'])
-            
-            # Get all tables
+            file_info = self.data_entries['file_info']
             tables = self.data_entries['tables']
             
-            if os.path.exists(file_path) and tables[0] is not None:
-                # Determine file type and read into DataFrame
-                file_ext = Path(file_path).suffix.lower()
-                
-                if file_ext == '.csv':
-                    file_df = pl.read_csv(file_path)
-                elif file_ext in ['.xlsx', '.xls']:
-                    # Convert pandas to polars
-                    pandas_df = pd.read_excel(file_path)
-                    file_df = pl.from_pandas(pandas_df)
-                else:
-                    QMessageBox.warning(self, "Error", "Unsupported file format")
-                    self.input_table.setItem(self.current_row, 5, QTableWidgetItem("Failed - Bad file format"))
-                    return
-                
-                # ====== ADD YOUR CUSTOM FUNCTION HERE ======
-                # Process using all dataframes and parameters
-                # Example: 
-                # result = process_xipv_data(
-                #     file_df, 
-                #     date, 
-                #     adjustment1, 
-                #     adjustment2,
-                #     tables[0],  # Table 1
-                #     tables[1],  # Table 2
-                #     tables[2],  # Table 3
-                #     tables[3]   # Table 4
-                # )
-                result = 0
-                # ============================================
-                
-                # Update table
-                self.input_table.setItem(self.current_row, 5, QTableWidgetItem("Completed"))
-                self.input_table.setItem(self.current_row, 6, QTableWidgetItem(str(result)))
-                
-                QMessageBox.information(self, "Success", f"Data processed successfully. Result: {result}")
+            # Fail fast on input the job would reject anyway
+            float(file_info['adjustment1'])
+            float(file_info['adjustment2'])
+            
+            if os.path.exists(file_info['file_path']) and tables[0] is not None:
+                self.start_job(self.current_row, file_info, tables)
             else:
                 QMessageBox.warning(self, "Error", "File not found or first table missing")
-                self.input_table.setItem(self.current_row, 5, QTableWidgetItem("Failed - Missing data"))
+                self.set_row_status(self.current_row, "Failed - Missing data")
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Processing error: {str(e)}")
-            self.input_table.setItem(self.current_row, 5, QTableWidgetItem(f"Failed - {str(e)[:20]}..."))
+            self.set_row_status(self.current_row, f"Failed - {str(e)[:20]}...")
+    
+    def start_job(self, row, file_info, tables):
+        """Run one XIPV job in the background; its signals update the row"""
+        job = XIPVJob(row, file_info, tables)
+        job.signals.progress.connect(self.on_job_progress)
+        job.signals.finished.connect(self.on_job_finished)
+        job.signals.failed.connect(self.on_job_failed)
+        job.signals.cancelled.connect(self.on_job_cancelled)
+        self.jobs[row] = job
+        self.set_row_status(row, "Queued")
+        self.thread_pool.start(job)
+    
+    def run_pending_jobs(self):
+        """
+        Process every pending row at once on the thread pool.
+        
+        All rows are validated before any of them starts; rows that can't
+        run are marked failed, the rest run at most parallel_job_limit() at
+        a time and report back into the table as each one finishes.
+        """
+        pending = []
+        for row, entries in sorted(self.row_entries.items()):
+            status_item = self.input_table.item(row, 5)
+            if row in self.jobs or status_item is None or status_item.text() != "Pending":
+                continue
+            reason = validate_entries(entries['file_info'], entries['tables'])
+            if reason is None:
+                pending.append((row, entries))
+            else:
+                self.row_entries.pop(row)
+                self.set_row_status(row, f"Failed - {reason}")
+        
+        if not pending:
+            QMessageBox.information(self, "Run Pending", "There are no pending runs to process.")
+            return
+        
+        if not self.batch_rows:
+            self.batch_counts = {}
+        for row, entries in pending:
+            self.batch_rows.add(row)
+            self.start_job(row, entries['file_info'], entries['tables'])
+    
+    def job_done(self, row, outcome):
+        """
+        Forget a finished job. Returns True if it belonged to a batch, whose
+        summary is shown once its last row is done.
+        """
+        self.jobs.pop(row, None)
+        self.row_entries.pop(row, None)
+        if row not in self.batch_rows:
+            return False
+        
+        self.batch_rows.discard(row)
+        self.batch_counts[outcome] = self.batch_counts.get(outcome, 0) + 1
+        if not self.batch_rows:
+            summary = ", ".join(f"{count} {name}" for name, count in self.batch_counts.items())
+            QMessageBox.information(self, "Batch Finished", f"Pending runs processed: {summary}")
+        return True
+    
+    def set_row_status(self, row, status, result=None):
+        """Update the Status (and optionally Result) column of an input_table row"""
+        self.input_table.setItem(row, 5, QTableWidgetItem(status))
+        if result is not None:
+            self.input_table.setItem(row, 6, QTableWidgetItem(str(result)))
+    
+    def cancel_selected_jobs(self):
+        """Cancel the running or pending jobs of the selected rows"""
+        rows = {index.row() for index in self.input_table.selectedIndexes()}
+        for row in rows:
+            job = self.jobs.get(row)
+            if job is not None:
+                job.cancel()
+                self.set_row_status(row, "Cancelling...")
+            elif self.row_entries.pop(row, None) is not None:
+                # Pending row that was never started
+                self.set_row_status(row, "Cancelled")
+    
+    def on_job_progress(self, row, percent, step):
+        if row in self.jobs and not self.jobs[row].is_cancelled():
+            self.set_row_status(row, f"{step}... {percent}%")
+    
+    def on_job_finished(self, row, result):
+        self.set_row_status(row, "Completed", result)
+        if not self.job_done(row, "completed"):
+            QMessageBox.information(self, "Success", f"Data processed successfully. Result: {result}")
+    
+    def on_job_failed(self, row, message):
+        self.set_row_status(row, f"Failed - {message[:20]}...")
+        if not self.job_done(row, "failed"):
+            QMessageBox.critical(self, "Error", f"Processing error: {message}")
+    
+    def on_job_cancelled(self, row):
+        self.set_row_status(row, "Cancelled")
+        self.job_done(row, "cancelled")
+    
+    def closeEvent(self, event):
+        # Stop queued and running jobs rather than leaving them to finish unseen
+        for job in self.jobs.values():
+            job.cancel()
+        super().closeEvent(event)
 
 
 # Modified Dialog for XIPV table input (supports mandatory/optional)
@@ -440,6 +528,7 @@ class XIPVTableDialog(QDialog):
         self.table_number = table_number
         self.is_mandatory = is_mandatory
         self.table_data = None
+        self.table_frame = None  # table_data parsed into a polars DataFrame
         
         layout = QVBoxLayout()
         
@@ -457,11 +546,14 @@ class XIPVTableDialog(QDialog):
         self.data_text.setPlaceholderText("Paste Excel data here...")
         
         # Preview area
-        preview_label = QLabel("Data Preview:")
+        self.preview_label = QLabel("Data Preview:")
         self.preview_table = QTableWidget()
         
-        # Connect paste event
-        self.data_text.textChanged.connect(self.update_preview)
+        # Connect paste event; parsing waits until edits stop
+        self.parser = PastedTableParser(self.data_text.toPlainText, self)
+        self.parser.preview_ready.connect(self.update_preview)
+        self.parser.table_ready.connect(self.update_row_count)
+        self.data_text.textChanged.connect(self.parser.schedule)
         
         # Buttons
         button_box = QHBoxLayout()
@@ -476,49 +568,51 @@ class XIPVTableDialog(QDialog):
         # Add to layout
         layout.addWidget(instructions)
         layout.addWidget(self.data_text)
-        layout.addWidget(preview_label)
+        layout.addWidget(self.preview_label)
         layout.addWidget(self.preview_table)
         layout.addLayout(button_box)
         
         self.setLayout(layout)
 
-    def update_preview(self):
-        text = self.data_text.toPlainText()
-        if text:
-            try:
-                # Convert the pasted text into a file-like object
-                text_io = StringIO(text)
-
-                # Try to parse the text as a DataFrame
-                df = pd.read_csv(text_io, sep="\t")
-
-                # Update preview table
-                self.preview_table.setRowCount(min(5, len(df)))
-                self.preview_table.setColumnCount(len(df.columns))
-                self.preview_table.setHorizontalHeaderLabels(df.columns)
-
-                # Fill preview data (first 5 rows)
-                for i in range(min(5, len(df))):
-                    for j in range(len(df.columns)):
-                        item = QTableWidgetItem(str(df.iloc[i, j]))
-                        self.preview_table.setItem(i, j, item)
-
-                # Resize columns to content
-                self.preview_table.resizeColumnsToContents()
-
-                # Store the data
-                self.table_data = text
-            except Exception as e:
-                # Handle parsing failures
-                self.preview_table.setRowCount(0)
-                self.preview_table.setColumnCount(0)
-                self.table_data = None
-                print(f"Error parsing data: {e}")
-        else:
-            # Clear preview if no text
+    def update_preview(self, df):
+        """Show the first rows parsed by self.parser, or clear the preview if there are none"""
+        self.preview_label.setText("Data Preview:")
+        if df is None:
             self.preview_table.setRowCount(0)
             self.preview_table.setColumnCount(0)
-            self.table_data = None
+            return
+        
+        # Update preview table
+        preview_rows = df.rows()
+        self.preview_table.setRowCount(len(preview_rows))
+        self.preview_table.setColumnCount(len(df.columns))
+        self.preview_table.setHorizontalHeaderLabels(df.columns)
+        
+        # Fill preview data (first 5 rows)
+        for i, row in enumerate(preview_rows):
+            for j, value in enumerate(row):
+                item = QTableWidgetItem(str(value))
+                self.preview_table.setItem(i, j, item)
+        
+        # Resize columns to content
+        self.preview_table.resizeColumnsToContents()
+    
+    def update_row_count(self, df):
+        """Show the size of the full parse once the background thread finishes it"""
+        if df is not None:
+            self.preview_label.setText(f"Data Preview ({df.height} rows):")
+    
+    def accept(self):
+        # Take the full parse, waiting for it if the background thread is still running
+        try:
+            self.table_frame = self.parser.table()
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to parse table data: {str(e)}")
+            return
+        
+        # Store the data
+        self.table_data = self.data_text.toPlainText() if self.table_frame is not None else None
+        super().accept()
 
 
 # New dialog for managing remaining tables
@@ -575,10 +669,12 @@ class XIPVRemainingTablesDialog(QDialog):
         import_button.clicked.connect(lambda: self.import_new_data(table_num-1))
         tab_layout.addWidget(import_button)
         
-        # Table widget to display/edit data
-        table_widget = QTableWidget()
+        # Table view to display/edit data; cells are read from the frame as they are drawn
+        table_widget = QTableView()
+        table_widget.setModel(PolarsTableModel(parent=table_widget))
         self.populate_table_widget(table_widget, table_data)
-        table_widget.itemChanged.connect(lambda: self.handle_table_edit(table_num-1, table_widget))
+        table_widget.model().dataChanged.connect(lambda: self.handle_table_edit(table_num-1, table_widget))
+        table_widget.model().edit_rejected.connect(lambda message: QMessageBox.warning(self, "Invalid Value", message))
         
         tab_layout.addWidget(QLabel("Default Data (editable):"))
         tab_layout.addWidget(table_widget)
@@ -590,28 +686,10 @@ class XIPVRemainingTablesDialog(QDialog):
         return tab_widget
     
     def populate_table_widget(self, table_widget, table_data):
-        """Populate a QTableWidget with data from a polars DataFrame"""
-        if table_data is None or table_data.is_empty():
-            table_widget.setRowCount(0)
-            table_widget.setColumnCount(0)
-            return
-        
-        # Convert polars to pandas for easier handling
-        pandas_df = table_data.to_pandas()
-        
-        # Set table dimensions
-        table_widget.setRowCount(len(pandas_df))
-        table_widget.setColumnCount(len(pandas_df.columns))
-        table_widget.setHorizontalHeaderLabels(pandas_df.columns)
-        
-        # Fill data
-        for i in range(len(pandas_df)):
-            for j in range(len(pandas_df.columns)):
-                value = pandas_df.iloc[i, j]
-                item = QTableWidgetItem(str(value))
-                table_widget.setItem(i, j, item)
+        """Show a polars DataFrame in a table view"""
+        table_widget.model().set_frame(table_data)
         
-        # Resize columns to content
+        # Resize columns to content (Qt only measures a sample of the rows)
         table_widget.resizeColumnsToContents()
     
     def import_new_data(self, table_index):
@@ -621,10 +699,8 @@ class XIPVRemainingTablesDialog(QDialog):
             table_data = dialog.table_data
             if table_data:
                 try:
-                    # Parse the clipboard data into pandas DataFrame
-                    pandas_df = pd.read_clipboard(sep='\t')
-                    # Convert to polars
-                    pl_df = pl.from_pandas(pandas_df)
+                    # Use the frame the dialog already parsed
+                    pl_df = dialog.table_frame
                     
                     # Update the table
                     self.tables[table_index] = pl_df
@@ -641,34 +717,16 @@ class XIPVRemainingTablesDialog(QDialog):
                     QMessageBox.critical(self, "Error", f"Failed to parse table data: {str(e)}")
     
     def handle_table_edit(self, table_index, table_widget):
-        """Handle edits to the table widget"""
-        try:
-            # Get headers
-            headers = []
-            for j in range(table_widget.columnCount()):
-                headers.append(table_widget.horizontalHeaderItem(j).text())
-            
-            # Get all data
-            data = []
-            for i in range(table_widget.rowCount()):
-                row_data = []
-                for j in range(table_widget.columnCount()):
-                    item = table_widget.item(i, j)
-                    value = item.text() if item else ""
-                    row_data.append(value)
-                data.append(row_data)
-            
-            # Create pandas DataFrame and convert to polars
-            pandas_df = pd.DataFrame(data, columns=headers)
-            pl_df = pl.from_pandas(pandas_df)
-            
-            # Update the table
-            self.tables[table_index] = pl_df
-            
-            # Mark as modified
-            self.modified_tables.add(table_index)
-        except Exception as e:
-            print(f"Error updating table data: {str(e)}")
+        """Handle edits to the table view"""
+        # The model logs the edited cells; they are applied in accept()
+        self.modified_tables.add(table_index)
+    
+    def accept(self):
+        # Apply each edited table's logged cell edits in one batch
+        for table_index in self.modified_tables:
+            table_widget = getattr(self, f"table{table_index+1}_widget")
+            self.tables[table_index] = table_widget.model().apply_edits()
+        super().accept()
 
 
 # Dialog for XIPV file info input (first popup)
@@ -1050,6 +1108,7 @@ class XReservesAllocationWindow(QMainWindow):
             'tables': [None] * 7  # 2 mandatory + 5 optional tables
         }
         self.default_data_path = "default_tables.xlsx"
+        self.default_tables = get_default_tables(self.default_data_path)
         
     def init_ui(self):
         self.setWindowTitle("XReserves Allocation")
@@ -1101,8 +1160,7 @@ class XReservesAllocationWindow(QMainWindow):
         if dialog.exec_():
             if dialog.table_data:
                 try:
-                    pandas_df = pd.read_clipboard(sep='\t')
-                    pl_df = pl.from_pandas(pandas_df)
+                    pl_df = dialog.table_frame
                     self.data_entries['tables'][0] = pl_df
                     self.show_mandatory_table2_dialog()
                 except Exception as e:
@@ -1119,8 +1177,7 @@ class XReservesAllocationWindow(QMainWindow):
         if dialog.exec_():
             if dialog.table_data:
                 try:
-                    pandas_df = pd.read_clipboard(sep='\t')
-                    pl_df = pl.from_pandas(pandas_df)
+                    pl_df = dialog.table_frame
                     self.data_entries['tables'][1] = pl_df
                     self.show_remaining_tables_dialog()
                 except Exception as e:
@@ -1163,8 +1220,7 @@ class XReservesAllocationWindow(QMainWindow):
         if os.path.exists(self.default_data_path):
             for i in range(5):  # 5 optional tables
                 try:
-                    pandas_df = pd.read_excel(self.default_data_path, sheet_name=f"Table{i+3}")
-                    self.data_entries['tables'][i+2] = pl.from_pandas(pandas_df)
+                    self.data_entries['tables'][i+2] = self.default_tables.table(f"Table{i+3}")
                 except Exception as e:
                     print(f"Error loading default table {i+3}: {str(e)}")
                     self.data_entries['tables'][i+2] = pl.DataFrame()
@@ -1175,10 +1231,12 @@ class XReservesAllocationWindow(QMainWindow):
     def save_default_tables(self, modified_indices):
         """Save modified default tables back to Excel"""
         if modified_indices and os.path.exists(self.default_data_path):
-            with pd.ExcelWriter(self.default_data_path, mode='a', if_sheet_exists='replace') as writer:
-                for i in modified_indices:
-                    pandas_df = self.data_entries['tables'][i+2].to_pandas()
-                    pandas_df.to_excel(writer, sheet_name=f"Table{i+3}", index=False)
+            saved = self.default_tables.save({
+                f"Table{i+3}": self.data_entries['tables'][i+2] for i in modified_indices
+            })
+            # Keep the tables in the dtypes they were saved with
+            for i in modified_indices:
+                self.data_entries['tables'][i+2] = saved[f"Table{i+3}"]
     
     def process_allocation(self):
         try:
@@ -1197,6 +1255,7 @@ class XReservesTableDialog(QDialog):
         self.table_number = table_number
         self.is_mandatory = is_mandatory
         self.table_data = None
+        self.table_frame = None  # table_data parsed into a polars DataFrame
         
         layout = QVBoxLayout()
         
@@ -1214,11 +1273,14 @@ class XReservesTableDialog(QDialog):
         self.data_text.setPlaceholderText("Paste Excel data here...")
         
         # Preview area
-        preview_label = QLabel("Data Preview:")
+        self.preview_label = QLabel("Data Preview:")
         self.preview_table = QTableWidget()
         
-        # Connect paste event
-        self.data_text.textChanged.connect(self.update_preview)
+        # Connect paste event; parsing waits until edits stop
+        self.parser = PastedTableParser(self.data_text.toPlainText, self)
+        self.parser.preview_ready.connect(self.update_preview)
+        self.parser.table_ready.connect(self.update_row_count)
+        self.data_text.textChanged.connect(self.parser.schedule)
         
         # Buttons
         button_box = QHBoxLayout()
@@ -1233,49 +1295,51 @@ class XReservesTableDialog(QDialog):
         # Add to layout
         layout.addWidget(instructions)
         layout.addWidget(self.data_text)
-        layout.addWidget(preview_label)
+        layout.addWidget(self.preview_label)
         layout.addWidget(self.preview_table)
         layout.addLayout(button_box)
         
         self.setLayout(layout)
 
-    def update_preview(self):
-        text = self.data_text.toPlainText()
-        if text:
-            try:
-                # Convert the pasted text into a file-like object
-                text_io = StringIO(text)
-
-                # Try to parse the text as a DataFrame
-                df = pd.read_csv(text_io, sep="\t")
-
-                # Update preview table
-                self.preview_table.setRowCount(min(5, len(df)))
-                self.preview_table.setColumnCount(len(df.columns))
-                self.preview_table.setHorizontalHeaderLabels(df.columns)
-
-                # Fill preview data (first 5 rows)
-                for i in range(min(5, len(df))):
-                    for j in range(len(df.columns)):
-                        item = QTableWidgetItem(str(df.iloc[i, j]))
-                        self.preview_table.setItem(i, j, item)
-
-                # Resize columns to content
-                self.preview_table.resizeColumnsToContents()
-
-                # Store the data
-                self.table_data = text
-            except Exception as e:
-                # Handle parsing failures
-                self.preview_table.setRowCount(0)
-                self.preview_table.setColumnCount(0)
-                self.table_data = None
-                print(f"Error parsing data: {e}")
-        else:
-            # Clear preview if no text
+    def update_preview(self, df):
+        """Show the first rows parsed by self.parser, or clear the preview if there are none"""
+        self.preview_label.setText("Data Preview:")
+        if df is None:
             self.preview_table.setRowCount(0)
             self.preview_table.setColumnCount(0)
-            self.table_data = None
+            return
+        
+        # Update preview table
+        preview_rows = df.rows()
+        self.preview_table.setRowCount(len(preview_rows))
+        self.preview_table.setColumnCount(len(df.columns))
+        self.preview_table.setHorizontalHeaderLabels(df.columns)
+        
+        # Fill preview data (first 5 rows)
+        for i, row in enumerate(preview_rows):
+            for j, value in enumerate(row):
+                item = QTableWidgetItem(str(value))
+                self.preview_table.setItem(i, j, item)
+        
+        # Resize columns to content
+        self.preview_table.resizeColumnsToContents()
+    
+    def update_row_count(self, df):
+        """Show the size of the full parse once the background thread finishes it"""
+        if df is not None:
+            self.preview_label.setText(f"Data Preview ({df.height} rows):")
+    
+    def accept(self):
+        # Take the full parse, waiting for it if the background thread is still running
+        try:
+            self.table_frame = self.parser.table()
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to parse table data: {str(e)}")
+            return
+        
+        # Store the data
+        self.table_data = self.data_text.toPlainText() if self.table_frame is not None else None
+        super().accept()
 
 
 # Class for remaining XReserves tables dialog (similar to XIPV)
@@ -1331,10 +1395,12 @@ class XReservesRemainingTablesDialog(QDialog):
         import_button.clicked.connect(lambda: self.import_new_data(table_num-3))  # Adjusted index calculation
         tab_layout.addWidget(import_button)
         
-        # Table widget to display/edit data
-        table_widget = QTableWidget()
+        # Table view to display/edit data; cells are read from the frame as they are drawn
+        table_widget = QTableView()
+        table_widget.setModel(PolarsTableModel(parent=table_widget))
         self.populate_table_widget(table_widget, table_data)
-        table_widget.itemChanged.connect(lambda: self.handle_table_edit(table_num-3, table_widget))  # Adjusted index calculation
+        table_widget.model().dataChanged.connect(lambda: self.handle_table_edit(table_num-3, table_widget))  # Adjusted index calculation
+        table_widget.model().edit_rejected.connect(lambda message: QMessageBox.warning(self, "Invalid Value", message))
         
         tab_layout.addWidget(QLabel("Default Data (editable):"))
         tab_layout.addWidget(table_widget)
@@ -1346,28 +1412,10 @@ class XReservesRemainingTablesDialog(QDialog):
         return tab_widget
     
     def populate_table_widget(self, table_widget, table_data):
-        """Populate a QTableWidget with data from a polars DataFrame"""
-        if table_data is None or table_data.is_empty():
-            table_widget.setRowCount(0)
-            table_widget.setColumnCount(0)
-            return
-        
-        # Convert polars to pandas for easier handling
-        pandas_df = table_data.to_pandas()
+        """Show a polars DataFrame in a table view"""
+        table_widget.model().set_frame(table_data)
         
-        # Set table dimensions
-        table_widget.setRowCount(len(pandas_df))
-        table_widget.setColumnCount(len(pandas_df.columns))
-        table_widget.setHorizontalHeaderLabels(pandas_df.columns)
-        
-        # Fill data
-        for i in range(len(pandas_df)):
-            for j in range(len(pandas_df.columns)):
-                value = pandas_df.iloc[i, j]
-                item = QTableWidgetItem(str(value))
-                table_widget.setItem(i, j, item)
-        
-        # Resize columns to content
+        # Resize columns to content (Qt only measures a sample of the rows)
         table_widget.resizeColumnsToContents()
     
     def import_new_data(self, table_index):
@@ -1377,10 +1425,8 @@ class XReservesRemainingTablesDialog(QDialog):
             table_data = dialog.table_data
             if table_data:
                 try:
-                    # Parse the clipboard data into pandas DataFrame
-                    pandas_df = pd.read_clipboard(sep='\t')
-                    # Convert to polars
-                    pl_df = pl.from_pandas(pandas_df)
+                    # Use the frame the dialog already parsed
+                    pl_df = dialog.table_frame
                     
                     # Update the table
                     self.tables[table_index] = pl_df
@@ -1397,34 +1443,16 @@ class XReservesRemainingTablesDialog(QDialog):
                     QMessageBox.critical(self, "Error", f"Failed to parse table data: {str(e)}")
     
     def handle_table_edit(self, table_index, table_widget):
-        """Handle edits to the table widget"""
-        try:
-            # Get headers
-            headers = []
-            for j in range(table_widget.columnCount()):
-                headers.append(table_widget.horizontalHeaderItem(j).text())
-            
-            # Get all data
-            data = []
-            for i in range(table_widget.rowCount()):
-                row_data = []
-                for j in range(table_widget.columnCount()):
-                    item = table_widget.item(i, j)
-                    value = item.text() if item else ""
-                    row_data.append(value)
-                data.append(row_data)
-            
-            # Create pandas DataFrame and convert to polars
-            pandas_df = pd.DataFrame(data, columns=headers)
-            pl_df = pl.from_pandas(pandas_df)
-            
-            # Update the table
-            self.tables[table_index] = pl_df
-            
-            # Mark as modified
-            self.modified_tables.add(table_index)
-        except Exception as e:
-            print(f"Error updating table data: {str(e)}")
+        """Handle edits to the table view"""
+        # The model logs the edited cells; they are applied in accept()
+        self.modified_tables.add(table_index)
+    
+    def accept(self):
+        # Apply each edited table's logged cell edits in one batch
+        for table_index in self.modified_tables:
+            table_widget = getattr(self, f"table{table_index+3}_widget")
+            self.tables[table_index] = table_widget.model().apply_edits()
+        super().accept()
 
 # YReserves Window
 class YReservesWindow(QMainWindow):
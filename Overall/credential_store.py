@@ -0,0 +1,139 @@
+import hashlib
+import hmac
+import os
+import pandas as pd
+
+# PBKDF2 settings for password hashes written to the credentials workbook
+HASH_NAME = 'sha256'
+ITERATIONS = 200_000
+SALT_BYTES = 16
+
+
+def hash_password(password, salt=None, iterations=ITERATIONS):
+    """
+    Salted PBKDF2 hash of a password.
+
+    Parameters:
+    password (str): the password to hash
+    salt (bytes): salt to use, a random one is generated when omitted
+    iterations (int): PBKDF2 rounds
+
+    Returns:
+    (salt, digest) as bytes
+    """
+    if salt is None:
+        salt = os.urandom(SALT_BYTES)
+    return salt, hashlib.pbkdf2_hmac(HASH_NAME, password.encode('utf-8'), salt, iterations)
+
+
+class CredentialStore:
+    """
+    Usernames and salted password hashes from the login workbook, read once
+    and looked up by username.
+
+    The workbook is parsed again only when its size or modification time
+    changes. It may hold 'salt', 'iterations' and 'password_hash' columns
+    (as written by Generate.py; files without 'iterations' used ITERATIONS)
+    or, for older files, a plaintext 'password' column which is hashed as
+    it is loaded so no plaintext is kept in memory. Plaintext workbooks are
+    converted with migrate_workbook (or Generate.py's migrate option).
+    """
+    def __init__(self, path):
+        self.path = path
+        self.file_key = None
+        # username -> (salt, iterations, digest)
+        self.users = {}
+        # Rounds used by the loaded file, also spent on unknown usernames
+        self.iterations = ITERATIONS
+
+    def refresh(self):
+        """Re-read the workbook if it changed since it was last loaded"""
+        stat = os.stat(self.path)
+        file_key = (stat.st_size, stat.st_mtime_ns)
+        if file_key == self.file_key:
+            return
+
+        # Read everything as text so numeric-looking passwords keep their digits
+        credentials_df = pd.read_excel(self.path, dtype=str)
+        users = {}
+        iterations = ITERATIONS
+        if 'password_hash' in credentials_df.columns:
+            if 'iterations' not in credentials_df.columns:
+                credentials_df['iterations'] = str(ITERATIONS)
+            rows = credentials_df[['username', 'salt', 'iterations', 'password_hash']].dropna()
+            for username, salt, rounds, password_hash in rows.itertuples(index=False, name=None):
+                users[username] = (bytes.fromhex(salt), int(rounds), bytes.fromhex(password_hash))
+            # Unknown usernames cost as much as the slowest stored hash
+            iterations = max((entry[1] for entry in users.values()), default=ITERATIONS)
+        else:
+            rows = credentials_df[['username', 'password']].dropna()
+            # The plaintext is on disk anyway, so a single round is enough here
+            iterations = 1
+            for username, password in rows.itertuples(index=False, name=None):
+                salt, digest = hash_password(password, iterations=iterations)
+                users[username] = (salt, iterations, digest)
+
+        self.users = users
+        self.iterations = iterations
+        self.file_key = file_key
+
+    def verify(self, username, password):
+        """Return True if password is the one stored for username"""
+        self.refresh()
+        entry = self.users.get(username)
+        if entry is None:
+            # Hash anyway so unknown usernames take as long as wrong passwords
+            hash_password(password, iterations=self.iterations)
+            return False
+        salt, iterations, digest = entry
+        return hmac.compare_digest(hash_password(password, salt, iterations)[1], digest)
+
+
+def hashed_rows(credentials, iterations=ITERATIONS):
+    """
+    Workbook rows for (username, password) pairs, with the password replaced
+    by its salt, PBKDF2 rounds and hash.
+
+    Returns:
+    list of dicts with username, salt, iterations and password_hash
+    """
+    rows = []
+    for username, password in credentials:
+        salt, digest = hash_password(password, iterations=iterations)
+        rows.append({"username": username, "salt": salt.hex(),
+                     "iterations": iterations, "password_hash": digest.hex()})
+    return rows
+
+
+def migrate_workbook(path, output_path=None):
+    """
+    Replace the plaintext 'password' column of a login workbook with salted
+    hashes, so the file no longer holds any passwords.
+
+    Parameters:
+    path (str): workbook with username and password columns
+    output_path (str): where to write the hashed workbook, path itself by default
+
+    Returns:
+    number of users migrated
+    """
+    credentials_df = pd.read_excel(path, dtype=str)
+    if 'password' not in credentials_df.columns:
+        raise ValueError(f"{path} has no plaintext password column")
+    rows = credentials_df[['username', 'password']].dropna()
+    pd.DataFrame(hashed_rows(rows.itertuples(index=False, name=None))).to_excel(
+        output_path or path, index=False
+    )
+    return len(rows)
+
+
+# path -> CredentialStore shared by every login window of this process
+_stores = {}
+
+
+def get_credential_store(path):
+    """CredentialStore for a workbook, created on first use"""
+    path = os.path.abspath(path)
+    if path not in _stores:
+        _stores[path] = CredentialStore(path)
+    return _stores[path]
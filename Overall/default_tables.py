@@ -0,0 +1,149 @@
+import os
+import shutil
+import pandas as pd
+import polars as pl
+from table_schema import typed_frame
+
+
+def mirror_dir(path):
+    """Hidden folder next to the workbook holding one Parquet file per sheet"""
+    folder, name = os.path.split(os.path.abspath(path))
+    return os.path.join(folder, f".{name}.tables")
+
+
+class DefaultTableCache:
+    """
+    The sheets of the default tables workbook as polars DataFrames, parsed
+    once and kept in memory. Each sheet is converted to compact dtypes
+    (numbers, dates, categoricals) and its schema is kept with it, so a
+    saved table keeps the dtypes it was loaded with.
+
+    The whole workbook is read in one pass (sheet_name=None) and mirrored as
+    Parquet, so even a new process only parses the Excel file again once it
+    has changed. Changes are spotted by the workbook's size and mtime.
+    Frames are shared between windows; polars operations return new frames,
+    so callers replace tables rather than modifying them.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.file_key = None
+        self.sheets = {}  # sheet name -> polars DataFrame
+        self.errors = {}  # sheet name -> why it couldn't be loaded
+        self.schemas = {}  # sheet name -> dtypes the cached frame was converted to
+
+    def current_key(self):
+        stat = os.stat(self.path)
+        return (stat.st_size, stat.st_mtime_ns)
+
+    def refresh(self):
+        """Load the workbook if it changed since it was last loaded"""
+        if not os.path.exists(self.path):
+            self.file_key, self.sheets, self.errors, self.schemas = None, {}, {}, {}
+            return
+
+        file_key = self.current_key()
+        if file_key == self.file_key:
+            return
+
+        if not self.read_mirror(file_key):
+            self.read_workbook()
+            self.write_mirror(file_key, self.sheets)
+        self.file_key = file_key
+
+    def read_workbook(self):
+        """Parse every sheet of the workbook in a single read"""
+        self.sheets, self.errors, self.schemas = {}, {}, {}
+        for sheet, pandas_df in pd.read_excel(self.path, sheet_name=None).items():
+            try:
+                self.sheets[sheet], self.schemas[sheet] = typed_frame(pl.from_pandas(pandas_df))
+            except Exception as e:
+                self.errors[sheet] = e
+
+    def read_mirror(self, file_key):
+        """Load the sheets from the Parquet mirror; False if it is missing or stale"""
+        folder = mirror_dir(self.path)
+        try:
+            with open(os.path.join(folder, 'key')) as f:
+                size, mtime_ns, *sheets = f.read().split('\n')
+            if (int(size), int(mtime_ns)) != file_key:
+                return False
+            self.sheets = {sheet: pl.read_parquet(os.path.join(folder, f"{sheet}.parquet"))
+                           for sheet in sheets if sheet}
+        except (OSError, ValueError, pl.exceptions.PolarsError):
+            return False
+        # Parquet keeps the dtypes, so the schemas come back with the frames
+        self.schemas = {sheet: dict(df.schema) for sheet, df in self.sheets.items()}
+        self.errors = {}
+        return True
+
+    def write_mirror(self, file_key, tables):
+        """Write the given sheets to the mirror and record which workbook it matches"""
+        folder = mirror_dir(self.path)
+        try:
+            os.makedirs(folder, exist_ok=True)
+            for sheet, df in tables.items():
+                df.write_parquet(os.path.join(folder, f"{sheet}.parquet"))
+            with open(os.path.join(folder, 'key'), 'w') as f:
+                f.write('\n'.join([str(file_key[0]), str(file_key[1])] + list(self.sheets)))
+        except (OSError, pl.exceptions.PolarsError):
+            # Without a mirror the workbook is just parsed again next time
+            shutil.rmtree(folder, ignore_errors=True)
+
+    def table(self, sheet):
+        """
+        One sheet as a polars DataFrame.
+
+        Raises KeyError if the workbook has no such sheet, or the error the
+        sheet failed to load with.
+        """
+        self.refresh()
+        if sheet in self.errors:
+            raise self.errors[sheet]
+        return self.sheets[sheet]
+
+    def save(self, tables):
+        """
+        Write sheets back to the workbook, creating it if needed, and keep
+        them as the cached frames so the write isn't parsed back in.
+
+        Each table is converted to its sheet's schema first, or to inferred
+        dtypes if it no longer fits it.
+
+        Parameters:
+        tables (dict): sheet name -> polars DataFrame
+
+        Returns:
+        dict: sheet name -> the converted DataFrame that was saved
+        """
+        self.refresh()
+        typed = {}
+        for sheet, df in tables.items():
+            typed[sheet], self.schemas[sheet] = typed_frame(df, self.schemas.get(sheet))
+        tables = typed
+        if os.path.exists(self.path):
+            writer = pd.ExcelWriter(self.path, mode='a', if_sheet_exists='replace')
+        else:
+            writer = pd.ExcelWriter(self.path)
+        with writer:
+            for sheet, df in tables.items():
+                # Convert polars to pandas for Excel writing
+                df.to_pandas().to_excel(writer, sheet_name=sheet, index=False)
+
+        self.sheets.update(tables)
+        for sheet in tables:
+            self.errors.pop(sheet, None)
+        self.file_key = self.current_key()
+        self.write_mirror(self.file_key, tables)
+        return tables
+
+
+# path -> DefaultTableCache shared by every window of this process
+_caches = {}
+
+
+def get_default_tables(path):
+    """DefaultTableCache for a workbook, created on first use"""
+    path = os.path.abspath(path)
+    if path not in _caches:
+        _caches[path] = DefaultTableCache(path)
+    return _caches[path]
@@ -0,0 +1,157 @@
+import threading
+import polars as pl
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, QTimer, Signal
+from table_schema import typed_frame
+
+# Excel puts a tab between cells when a range is copied
+PASTE_SEPARATOR = "\t"
+
+# Rows shown in the table dialogs' preview
+PREVIEW_ROWS = 5
+
+# Quiet time after the last edit before pasted text is parsed
+PREVIEW_DELAY_MS = 300
+
+
+def parse_pasted_table(text):
+    """
+    Parse a block of cells pasted from Excel into a polars DataFrame.
+
+    The first line holds the headers. Every cell is kept as text, exactly
+    as pasted, so codes like "007" keep their leading zeros; typed_frame
+    picks the column types afterwards.
+
+    Raises polars' parse errors (ComputeError, NoDataError) if the text
+    isn't a table.
+    """
+    return pl.read_csv(
+        text.encode('utf-8'),
+        separator=PASTE_SEPARATOR,
+        infer_schema=False,
+        truncate_ragged_lines=True
+    )
+
+
+def preview_text(text, rows):
+    """The header line and at most the first rows lines of text, without splitting the rest"""
+    end = -1
+    for _ in range(rows + 1):
+        end = text.find('\n', end + 1)
+        if end == -1:
+            return text
+    return text[:end]
+
+
+class FullParseSignals(QObject):
+    finished = Signal(int, object)  # generation, parsed DataFrame
+    failed = Signal(int, str)  # generation, message
+
+
+class FullParseJob(QRunnable):
+    """Parses one snapshot of the pasted text on a pool thread"""
+    def __init__(self, generation, text):
+        super().__init__()
+        self.generation = generation
+        self.text = text
+        self.frame = None
+        self.error = None
+        self.done = threading.Event()
+        self.signals = FullParseSignals()
+        # The parser reads the result after the run, so Qt mustn't delete the job
+        self.setAutoDelete(False)
+
+    def run(self):
+        try:
+            # Numbers, dates and categoricals from the pasted text
+            self.frame, _ = typed_frame(parse_pasted_table(self.text))
+        except Exception as e:
+            self.error = e
+        # Set before emitting so a waiting GUI thread never misses the result
+        self.done.set()
+        if self.error is None:
+            self.signals.finished.emit(self.generation, self.frame)
+        else:
+            self.signals.failed.emit(self.generation, str(self.error))
+
+
+class PastedTableParser(QObject):
+    """
+    Debounced parsing of the text pasted into a table dialog.
+
+    Every edit only restarts a short timer. Once typing or pasting stops,
+    the header and the first few lines are parsed for the preview, and the
+    whole text is parsed (with type conversion over every row) on a pool
+    thread. table() returns that full parse, waiting for it if it is still
+    running. Results for text that has since changed are dropped.
+    """
+    preview_ready = Signal(object)  # first rows as a DataFrame, or None if the text isn't a table
+    table_ready = Signal(object)  # full DataFrame, or None if it couldn't be parsed
+
+    def __init__(self, get_text, parent=None, preview_rows=PREVIEW_ROWS, delay_ms=PREVIEW_DELAY_MS):
+        """
+        Parameters:
+        get_text (callable): returns the current text, only called once edits settle
+        preview_rows (int): data rows parsed for the preview
+        delay_ms (int): quiet time after the last edit before parsing
+        """
+        super().__init__(parent)
+        self.get_text = get_text
+        self.preview_rows = preview_rows
+        self.generation = 0
+        self.job = None
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(delay_ms)
+        self.timer.timeout.connect(self.parse)
+
+    def schedule(self):
+        """Note that the text changed; parsing waits until edits stop"""
+        self.generation += 1
+        self.job = None
+        self.timer.start()
+
+    def parse(self):
+        """Parse the preview now and start the full parse in the background"""
+        self.timer.stop()
+        text = self.get_text()
+        if not text:
+            self.preview_ready.emit(None)
+            return
+
+        try:
+            preview = parse_pasted_table(preview_text(text, self.preview_rows)).head(self.preview_rows)
+        except Exception as e:
+            print(f"Error parsing data: {e}")
+            self.preview_ready.emit(None)
+            return
+        self.preview_ready.emit(preview)
+
+        self.job = FullParseJob(self.generation, text)
+        self.job.signals.finished.connect(self.on_parsed)
+        self.job.signals.failed.connect(self.on_failed)
+        QThreadPool.globalInstance().start(self.job)
+
+    def on_parsed(self, generation, frame):
+        if generation == self.generation:
+            self.table_ready.emit(frame)
+
+    def on_failed(self, generation, message):
+        if generation == self.generation:
+            print(f"Error parsing data: {message}")
+            self.table_ready.emit(None)
+
+    def table(self):
+        """
+        The fully parsed text, or None if there is none.
+
+        Raises the parse error if the text isn't a table.
+        """
+        if self.timer.isActive():
+            # Edits haven't settled yet, parse what is there now
+            self.parse()
+        if self.job is None:
+            return None
+        self.job.done.wait()
+        if self.job.error is not None:
+            raise self.job.error
+        return self.job.frame
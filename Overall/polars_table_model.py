@@ -0,0 +1,164 @@
+from collections import OrderedDict
+import polars as pl
+
+# Rows converted to Python values at a time when cells are drawn
+CHUNK_ROWS = 256
+
+BOOLEAN_TEXT = {'true': True, 'false': False, '1': True, '0': False}
+
+
+def cast_cell(text, dtype):
+    """
+    Convert the text typed into a cell to a value of the column's dtype.
+
+    An empty cell becomes null. Raises ValueError if the text doesn't fit
+    the column, e.g. letters in a numeric column.
+    """
+    if text == "":
+        return None
+    if dtype == pl.String or dtype == pl.Null:
+        return text
+    try:
+        if dtype == pl.Boolean:
+            return BOOLEAN_TEXT[text.strip().lower()]
+        series = pl.Series([text.strip()])
+        if dtype == pl.Date:
+            return series.str.to_date()[0]
+        if dtype == pl.Datetime:
+            return series.str.to_datetime()[0]
+        return series.cast(dtype)[0]
+    except (KeyError, pl.exceptions.PolarsError) as e:
+        raise ValueError(f"'{text}' is not a valid {dtype}") from e
+
+
+# QtCore module name -> PolarsTableModel built on it
+_model_classes = {}
+
+
+def table_model_class(QtCore):
+    """
+    PolarsTableModel for one Qt binding.
+
+    The Overall apps use PySide6 and the table pasters PyQt5, so each passes
+    in the QtCore it runs on, e.g. table_model_class(PySide6.QtCore).
+    """
+    if QtCore.__name__ in _model_classes:
+        return _model_classes[QtCore.__name__]
+
+    Qt = QtCore.Qt
+    QModelIndex = QtCore.QModelIndex
+    Signal = QtCore.Signal if hasattr(QtCore, 'Signal') else QtCore.pyqtSignal
+
+    class PolarsTableModel(QtCore.QAbstractTableModel):
+        """
+        Table model reading its cells straight from a polars DataFrame.
+
+        Views only ask for the cells they draw, so only those rows are ever
+        converted to Python values, a chunk at a time, and the last few chunks
+        are kept. Nothing is allocated per cell up front however large the
+        frame is. Edits are cast to the column's dtype and rejected if they
+        don't fit, with edit_rejected carrying the reason. Accepted edits go
+        into a cell-level log shown on top of the frame, and apply_edits()
+        writes them all into it at once, one scatter per edited column, instead
+        of copying a column on every keystroke.
+        """
+        edit_rejected = Signal(str)  # why a typed value doesn't fit its column
+
+        def __init__(self, frame=None, editable=True, parent=None, cache_chunks=8):
+            super().__init__(parent)
+            self.editable = editable
+            self.cache_chunks = cache_chunks
+            self.chunks = OrderedDict()  # chunk number -> list of row tuples
+            self.edits = {}  # (row, column) -> edited value not yet in frame
+            self.frame = frame if frame is not None else pl.DataFrame()
+
+        def set_frame(self, frame):
+            """Show a different DataFrame, dropping any edits not yet applied"""
+            self.beginResetModel()
+            self.frame = frame if frame is not None else pl.DataFrame()
+            self.chunks.clear()
+            self.edits.clear()
+            self.endResetModel()
+
+        def rowCount(self, parent=QModelIndex()):
+            return 0 if parent.isValid() else self.frame.height
+
+        def columnCount(self, parent=QModelIndex()):
+            return 0 if parent.isValid() else self.frame.width
+
+        def row_values(self, row):
+            """Values of one row, converted together with the rest of its chunk"""
+            chunk = row // CHUNK_ROWS
+            if chunk in self.chunks:
+                self.chunks.move_to_end(chunk)
+            else:
+                self.chunks[chunk] = self.frame.slice(chunk * CHUNK_ROWS, CHUNK_ROWS).rows()
+                while len(self.chunks) > self.cache_chunks:
+                    self.chunks.popitem(last=False)
+            return self.chunks[chunk][row - chunk * CHUNK_ROWS]
+
+        def data(self, index, role=Qt.DisplayRole):
+            if not index.isValid() or role not in (Qt.DisplayRole, Qt.EditRole):
+                return None
+            key = (index.row(), index.column())
+            value = self.edits[key] if key in self.edits else self.row_values(index.row())[index.column()]
+            return "" if value is None else str(value)
+
+        def headerData(self, section, orientation, role=Qt.DisplayRole):
+            if role != Qt.DisplayRole:
+                return None
+            if orientation == Qt.Horizontal:
+                return self.frame.columns[section]
+            return str(section + 1)
+
+        def flags(self, index):
+            flags = super().flags(index)
+            if self.editable and index.isValid():
+                flags |= Qt.ItemIsEditable
+            return flags
+
+        def setData(self, index, value, role=Qt.EditRole):
+            if role != Qt.EditRole or not index.isValid():
+                return False
+            dtype = self.frame.dtypes[index.column()]
+            try:
+                cell = cast_cell(str(value), dtype)
+            except ValueError as e:
+                self.edit_rejected.emit(str(e))
+                return False
+
+            self.edits[(index.row(), index.column())] = cell
+            self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.EditRole])
+            return True
+
+        def apply_edits(self):
+            """
+            Write the logged edits into the frame and return it.
+
+            Edits are grouped by column so each edited column is copied once,
+            however many of its cells changed.
+            """
+            if not self.edits:
+                return self.frame
+
+            by_column = {}
+            for (row, column), value in self.edits.items():
+                rows, values = by_column.setdefault(column, ([], []))
+                rows.append(row)
+                values.append(value)
+
+            columns = []
+            for column, (rows, values) in by_column.items():
+                series = self.frame.to_series(column)
+                if series.dtype == pl.Null:
+                    # A column that was entirely empty takes text from now on
+                    series = series.cast(pl.String)
+                columns.append(series.scatter(rows, pl.Series(values, dtype=series.dtype)))
+
+            self.frame = self.frame.with_columns(columns)
+            self.edits.clear()
+            self.chunks.clear()
+            return self.frame
+
+    _model_classes[QtCore.__name__] = PolarsTableModel
+    return PolarsTableModel
@@ -1,10 +1,16 @@
 import sys
 from PyQt5.QtWidgets import (
-    QApplication, QMainWindow, QTableWidget, QTableWidgetItem,
+    QApplication, QMainWindow, QTableView,
     QVBoxLayout, QPushButton, QWidget, QMessageBox
 )
+from PyQt5 import QtCore
 from PyQt5.QtGui import QClipboard
 import polars as pl
+from polars_table_model import table_model_class
+from table_schema import typed_frame
+
+# Same table model as the Overall apps, on PyQt5
+PolarsTableModel = table_model_class(QtCore)
 
 class ExcelTableApp(QMainWindow):
     def __init__(self):
@@ -14,8 +20,12 @@ class ExcelTableApp(QMainWindow):
         # Required headers
         self.required_headers = ["Question", "Option1", "Option2"]
 
-        # Create table widget
-        self.table_widget = QTableWidget()
+        # Create table view; cells are read from the frame as they are drawn
+        self.table_model = PolarsTableModel()
+        self.table_widget = QTableView()
+        self.table_widget.setModel(self.table_model)
+        self.table_model.edit_rejected.connect(self.show_error_message)
+        self.schema = None  # dtypes of the last converted table
         
         # Create buttons
         self.paste_button = QPushButton("Paste Table")
@@ -38,28 +48,22 @@ class ExcelTableApp(QMainWindow):
     def paste_table(self):
         clipboard = QApplication.clipboard()
         data = clipboard.text()  # Get clipboard text
-        rows = data.strip().split("\n")
-
-        if not rows:
+        if not data.strip():
             self.show_error_message("Clipboard is empty or contains invalid data.")
             return
 
-        # Populate the table
-        self.table_widget.setRowCount(len(rows))
-        self.table_widget.setColumnCount(len(rows[0].split("\t")))
-
-        for i, row in enumerate(rows):
-            columns = row.split("\t")
-            for j, cell in enumerate(columns):
-                self.table_widget.setItem(i, j, QTableWidgetItem(cell))
+        # Populate the table; the first row holds the headers and cells stay text
+        try:
+            dataframe = pl.read_csv(data.strip().encode("utf-8"), separator="\t",
+                                    quote_char=None, infer_schema=False, truncate_ragged_lines=True)
+        except pl.exceptions.PolarsError as e:
+            self.show_error_message(f"Clipboard is empty or contains invalid data.\n{e}")
+            return
+        self.table_model.set_frame(dataframe)
 
     def convert_to_polars(self):
         # Extract table headers
-        cols = self.table_widget.columnCount()
-        headers = [
-            self.table_widget.item(0, j).text() if self.table_widget.item(0, j) else ""
-            for j in range(cols)
-        ]
+        headers = self.table_model.frame.columns
 
         # Validate headers
         missing_headers = [h for h in self.required_headers if h not in headers]
@@ -74,18 +78,13 @@ class ExcelTableApp(QMainWindow):
             self.show_error_message(error_message)
             return
 
-        # Extract data
-        rows = self.table_widget.rowCount()
-        data = []
-        for i in range(1, rows):  # Skip the first row (headers)
-            row_data = []
-            for j in range(cols):
-                item = self.table_widget.item(i, j)
-                row_data.append(item.text() if item else "")
-            data.append(row_data)
-
-        # Create Polars DataFrame
-        dataframe = pl.DataFrame(data, schema=headers)
+        # The model holds the pasted data; apply the cells edited since
+        dataframe = self.table_model.apply_edits()
+
+        # Convert the pasted text to numbers, dates and categories, reusing
+        # the last conversion's schema while the data still fits it
+        dataframe, self.schema = typed_frame(dataframe, self.schema)
+        self.table_model.set_frame(dataframe)
 
         # Print DataFrame to terminal
         print("Polars DataFrame:")
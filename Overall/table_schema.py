@@ -0,0 +1,157 @@
+import polars as pl
+
+# A text column becomes categorical when it has at most this share of distinct values...
+CATEGORICAL_MAX_RATIO = 0.5
+# ...and at least this many rows, so short tables aren't all categorical
+CATEGORICAL_MIN_ROWS = 20
+
+# Text that reads back the same once stored as a number: no leading zeros
+# (codes like "007"), signs, exponents or thousands separators
+PLAIN_NUMBER = r"^-?(0|[1-9][0-9]*)(\.[0-9]+)?$"
+
+# Significant digits a Float64 always gives back unchanged
+MAX_NUMBER_DIGITS = 15
+
+
+def cleaned_text(column):
+    """A text column with surrounding spaces removed and empty cells as null"""
+    return pl.col(column).str.strip_chars().replace("", None)
+
+
+def plain_number(text):
+    """Whether each value of a text expression survives a round trip through Float64"""
+    return text.str.contains(PLAIN_NUMBER) & (text.str.count_matches("[0-9]") <= MAX_NUMBER_DIGITS)
+
+
+def conversion(column, source, target):
+    """
+    Expressions converting one column from dtype source to dtype target.
+
+    Returns:
+    (converted, lost) where lost counts the values that didn't survive the
+    conversion, e.g. text that isn't a number
+    """
+    if source == pl.String:
+        text = cleaned_text(column)
+        if target == pl.Date:
+            converted = text.str.to_date(strict=False)
+        elif target == pl.Datetime:
+            converted = text.str.to_datetime(strict=False)
+        elif target == pl.Categorical:
+            converted = text.cast(pl.Categorical)
+        else:
+            converted = text.cast(target, strict=False)
+        if target.is_numeric():
+            # Text like "007" casts fine but wouldn't read the same afterwards
+            return converted, (text.is_not_null() & ~plain_number(text)).sum()
+        return converted, text.count() - converted.count()
+
+    if source == pl.Datetime and target == pl.Date:
+        # Only lossless when every value is at midnight
+        original = pl.col(column)
+        return original.dt.date(), (original != original.dt.truncate("1d")).sum()
+
+    converted = pl.col(column).cast(pl.String if target == pl.Categorical else target, strict=False)
+    if target == pl.Categorical:
+        converted = converted.cast(pl.Categorical)
+    return converted, pl.col(column).count() - converted.count()
+
+
+def infer_schema(df):
+    """
+    Choose a compact dtype for every column of a table.
+
+    Text columns whose values are all plain numbers become Float64 and ones
+    that are all dates become Date; other text columns with few distinct
+    values become Categorical. A number with a leading zero, or one that
+    wouldn't read back the same, keeps its column as text. Datetime columns holding only midnights become
+    Date. Other columns keep their dtype.
+
+    Returns:
+    dict: column -> dtype
+    """
+    schema = dict(df.schema)
+    text_columns = [column for column, dtype in schema.items() if dtype == pl.String]
+
+    # Counts for every text column in one pass over the frame
+    counts = {}
+    if text_columns:
+        exprs = []
+        for column in text_columns:
+            _, lost_numbers = conversion(column, pl.String, pl.Float64)
+            exprs += [
+                cleaned_text(column).count().alias(f"{column}\0values"),
+                lost_numbers.alias(f"{column}\0not_numbers"),
+                cleaned_text(column).n_unique().alias(f"{column}\0distinct"),
+            ]
+        counts = df.select(exprs).row(0, named=True)
+
+    for column in text_columns:
+        values = counts[f"{column}\0values"]
+        if values == 0:
+            continue
+        if counts[f"{column}\0not_numbers"] == 0:
+            schema[column] = pl.Float64
+            continue
+        _, lost_dates = conversion(column, pl.String, pl.Date)
+        if df.select(lost_dates).item() == 0:
+            schema[column] = pl.Date
+        elif df.height >= CATEGORICAL_MIN_ROWS and counts[f"{column}\0distinct"] <= CATEGORICAL_MAX_RATIO * df.height:
+            schema[column] = pl.Categorical
+
+    for column, dtype in df.schema.items():
+        if dtype == pl.Datetime and df.height:
+            _, lost = conversion(column, dtype, pl.Date)
+            if df.select(lost).item() == 0:
+                schema[column] = pl.Date
+
+    return schema
+
+
+def apply_schema(df, schema):
+    """
+    Cast a table to a schema in a single vectorized select.
+
+    Columns the schema doesn't mention keep their dtype. Raises ValueError
+    if a column is missing or any of its values don't fit the schema's dtype.
+    """
+    missing = [column for column in schema if column not in df.columns]
+    if missing:
+        raise ValueError(f"Missing columns: {', '.join(missing)}")
+
+    converted, lost = [], []
+    for column, source in df.schema.items():
+        target = schema.get(column, source)
+        if target == source:
+            converted.append(pl.col(column))
+            continue
+        expr, lost_expr = conversion(column, source, target)
+        converted.append(expr.alias(column))
+        lost.append(lost_expr.alias(column))
+
+    if lost:
+        lost_counts = df.select(lost).row(0, named=True)
+        bad = [column for column, count in lost_counts.items() if count]
+        if bad:
+            raise ValueError(f"Values don't fit the schema in: {', '.join(bad)}")
+    return df.select(converted)
+
+
+def typed_frame(df, schema=None):
+    """
+    A table converted to compact dtypes, with the schema used.
+
+    A known schema (e.g. the one a default table was last saved with) is
+    applied when the table has the same columns and its data fits, so a
+    table keeps its dtypes across edits; otherwise one is inferred.
+
+    Returns:
+    (DataFrame, schema)
+    """
+    if schema is not None and set(schema) == set(df.columns):
+        try:
+            return apply_schema(df, schema), schema
+        except ValueError:
+            pass
+    schema = infer_schema(df)
+    return apply_schema(df, schema), schema
@@ -0,0 +1,76 @@
+import sys
+from PyQt5.QtWidgets import QApplication, QMainWindow, QTableView, QVBoxLayout, QPushButton, QWidget, QMessageBox
+from PyQt5 import QtCore
+from PyQt5.QtGui import QClipboard
+import polars as pl  # Import Polars
+from polars_table_model import table_model_class
+from table_schema import typed_frame
+
+# Same table model as the Overall apps, on PyQt5
+PolarsTableModel = table_model_class(QtCore)
+
+class ExcelTableApp(QMainWindow):
+    def __init__(self):
+        super().__init__()
+        self.setWindowTitle("Excel Table Paster")
+
+        # Create table view; cells are read from the frame as they are drawn
+        self.table_model = PolarsTableModel()
+        self.table_widget = QTableView()
+        self.table_widget.setModel(self.table_model)
+        self.table_model.edit_rejected.connect(self.show_error_message)
+        self.schema = None  # dtypes of the last converted table
+        
+        # Create buttons
+        self.paste_button = QPushButton("Paste Table")
+        self.paste_button.clicked.connect(self.paste_table)
+        
+        self.convert_button = QPushButton("Convert to Polars DataFrame")
+        self.convert_button.clicked.connect(self.convert_to_polars)
+
+        # Layout setup
+        layout = QVBoxLayout()
+        layout.addWidget(self.table_widget)
+        layout.addWidget(self.paste_button)
+        layout.addWidget(self.convert_button)
+
+        # Set central widget
+        container = QWidget()
+        container.setLayout(layout)
+        self.setCentralWidget(container)
+
+    def paste_table(self):
+        clipboard = QApplication.clipboard()
+        data = clipboard.text()  # Get clipboard text
+        if not data.strip():
+            return
+        # The first row holds the headers; cells stay text as they were pasted
+        try:
+            dataframe = pl.read_csv(data.strip().encode("utf-8"), separator="\t",
+                                    quote_char=None, infer_schema=False, truncate_ragged_lines=True)
+        except pl.exceptions.PolarsError as e:
+            self.show_error_message(f"Clipboard does not contain a table.\n{e}")
+            return
+        self.table_model.set_frame(dataframe)
+
+    def convert_to_polars(self):
+        # The model holds the pasted table; apply the cells edited since
+        dataframe = self.table_model.apply_edits()
+
+        # Convert the pasted text to numbers, dates and categories, reusing
+        # the last conversion's schema while the data still fits it
+        dataframe, self.schema = typed_frame(dataframe, self.schema)
+        self.table_model.set_frame(dataframe)
+
+        # Print DataFrame to terminal
+        print("Polars DataFrame:")
+        print(dataframe)
+
+    def show_error_message(self, message):
+        QMessageBox.warning(self, "Invalid Table", message)
+
+if __name__ == "__main__":
+    app = QApplication(sys.argv)
+    window = ExcelTableApp()
+    window.show()
+    sys.exit(app.exec_())
\ No newline at end of file
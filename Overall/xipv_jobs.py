@@ -0,0 +1,140 @@
+import os
+import threading
+import pandas as pd
+import polars as pl
+from pathlib import Path
+from PySide6.QtCore import QObject, QRunnable, Signal
+
+# Input file types read_input_file understands
+SUPPORTED_EXTENSIONS = ('.csv', '.xlsx', '.xls')
+
+# Upper bound on XIPV runs processed at the same time
+MAX_PARALLEL_JOBS = 4
+
+
+class JobCancelled(Exception):
+    """Raised inside a job when it was cancelled between steps"""
+
+
+def validate_entries(file_info, tables):
+    """
+    Check a run's entries before it is queued.
+
+    Returns:
+    str: short reason the run can't be processed, or None if it can
+    """
+    try:
+        float(file_info['adjustment1'])
+        float(file_info['adjustment2'])
+    except (KeyError, ValueError):
+        return "Bad adjustment"
+    file_path = file_info.get('file_path', '')
+    if not os.path.exists(file_path) or tables[0] is None:
+        return "Missing data"
+    if Path(file_path).suffix.lower() not in SUPPORTED_EXTENSIONS:
+        return "Bad file format"
+    return None
+
+
+def parallel_job_limit():
+    """Worker threads for a batch: MAX_PARALLEL_JOBS, or fewer on small machines"""
+    return max(1, min(MAX_PARALLEL_JOBS, os.cpu_count() or 1))
+
+
+def read_input_file(file_path):
+    """
+    Read an XIPV input file into a polars DataFrame.
+
+    Raises ValueError for anything other than .csv, .xlsx or .xls.
+    """
+    file_ext = Path(file_path).suffix.lower()
+    if file_ext == '.csv':
+        return pl.read_csv(file_path)
+    if file_ext in ['.xlsx', '.xls']:
+        # Convert pandas to polars
+        return pl.from_pandas(pd.read_excel(file_path))
+    raise ValueError("Bad file format")
+
+
+def process_xipv_data(file_df, date, adjustment1, adjustment2, table1, table2, table3, table4):
+    """
+    XIPV calculation on the input file and the four tables.
+
+    Runs on a worker thread, so it must not touch any widgets.
+    """
+    # ====== ADD YOUR CUSTOM FUNCTION HERE ======
+    # Process using all dataframes and parameters
+    result = 0
+    # ============================================
+    return result
+
+
+class XIPVJobSignals(QObject):
+    """
+    Signals of an XIPVJob. A QRunnable is not a QObject, so they live here;
+    each carries the input_table row the job belongs to.
+    """
+    progress = Signal(int, int, str)  # row, percent, step
+    finished = Signal(int, object)  # row, result
+    failed = Signal(int, str)  # row, message
+    cancelled = Signal(int)  # row
+
+
+class XIPVJob(QRunnable):
+    """
+    One XIPV run, executed on a QThreadPool instead of the GUI thread.
+
+    The job reads the input file and runs process_xipv_data, reporting each
+    step through its signals. cancel() can be called from the GUI thread at
+    any time; the job stops at the next step boundary and emits cancelled
+    instead of finished.
+    """
+    def __init__(self, row, file_info, tables):
+        """
+        Parameters:
+        row (int): input_table row the job reports to
+        file_info (dict): file_path, date, adjustment1 and adjustment2 as entered
+        tables (list): the four polars tables
+        """
+        super().__init__()
+        self.row = row
+        self.file_info = dict(file_info)
+        self.tables = list(tables)
+        self.signals = XIPVJobSignals()
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        """Ask the job to stop at its next step"""
+        self._cancel_event.set()
+
+    def is_cancelled(self):
+        return self._cancel_event.is_set()
+
+    def step(self, percent, text):
+        """Report progress, or stop here if the job was cancelled"""
+        if self.is_cancelled():
+            raise JobCancelled()
+        self.signals.progress.emit(self.row, percent, text)
+
+    def run(self):
+        try:
+            self.step(5, "Reading file")
+            file_df = read_input_file(self.file_info['file_path'])
+
+            self.step(50, "Calculating")
+            result = process_xipv_data(
+                file_df,
+                self.file_info['date'],
+                float(self.file_info['adjustment1']),
+                float(self.file_info['adjustment2']),
+                *self.tables
+            )
+
+            # A result that arrives after cancel() is discarded
+            self.step(100, "Done")
+        except JobCancelled:
+            self.signals.cancelled.emit(self.row)
+        except Exception as e:
+            self.signals.failed.emit(self.row, str(e))
+        else:
+            self.signals.finished.emit(self.row, result)
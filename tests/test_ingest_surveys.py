@@ -0,0 +1,89 @@
+import os
+import shutil
+import sqlite3
+import pytest
+import ingest_surveys
+
+FILES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "Files")
+
+
+@pytest.fixture
+def export_file(tmp_path, monkeypatch):
+    """A copy of survey_results.xlsx, written by temp.SurveyApp.export_results"""
+    # Keep the question bank's cache out of the user's cache folder
+    monkeypatch.delenv("LOCALAPPDATA", raising=False)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    path = tmp_path / "survey_results.xlsx"
+    shutil.copy(os.path.join(FILES_DIR, "survey_results.xlsx"), path)
+    return str(path)
+
+
+def stored_responses(store_path):
+    conn = sqlite3.connect(store_path)
+    try:
+        return conn.execute(
+            "SELECT question_id, category, response FROM responses ORDER BY rowid"
+        ).fetchall()
+    finally:
+        conn.close()
+
+
+def test_ingest_export_with_section_question_bank(export_file, tmp_path):
+    store_path = str(tmp_path / "store.db")
+    questions_path = os.path.join(FILES_DIR, "sample_survey.xlsx")
+
+    assert ingest_surveys.ingest([export_file], store_path, questions_path=questions_path) == 1
+
+    responses = stored_responses(store_path)
+    assert len(responses) == 15
+    assert responses[0] == ("cultural_0", "cultural", 2)
+    assert responses[1] == ("cultural_1", "cultural", 3)
+
+
+def test_ingest_export_without_question_bank(export_file, tmp_path):
+    store_path = str(tmp_path / "store.db")
+
+    assert ingest_surveys.ingest([export_file], store_path) == 1
+
+    responses = stored_responses(store_path)
+    assert len(responses) == 15
+    assert responses[0] == ("cultural_0", "Cultural", 2)
+
+
+def test_ingest_skips_files_already_ingested(export_file, tmp_path):
+    store_path = str(tmp_path / "store.db")
+
+    ingest_surveys.ingest([export_file], store_path)
+    assert ingest_surveys.ingest([export_file], store_path) == 0
+    assert len(stored_responses(store_path)) == 15
+
+
+def test_unmatched_questions_leave_nothing_behind(export_file, tmp_path):
+    store_path = str(tmp_path / "store.db")
+    # The analysis apps' bank holds different questions than the export
+    questions_path = os.path.join(FILES_DIR, "survey_questions.xlsx")
+
+    with pytest.raises(ValueError, match="not in the question bank"):
+        ingest_surveys.ingest([export_file], store_path, questions_path=questions_path)
+    assert stored_responses(store_path) == []
+
+
+def test_legacy_db_option_copies_respondents_once(tmp_path):
+    legacy_dir = tmp_path / "legacy"
+    legacy_dir.mkdir()
+    for name in ("Varun_20250331_100413.db", "kuvkutv_20250331_100609.db"):
+        shutil.copy(os.path.join(FILES_DIR, name), legacy_dir / name)
+    store_path = str(tmp_path / "store.db")
+
+    assert ingest_surveys.main(["--legacy-db", str(legacy_dir), "--store", store_path]) == 0
+    assert ingest_surveys.main(["--legacy-db", str(legacy_dir), "--store", store_path]) == 0
+
+    conn = sqlite3.connect(store_path)
+    try:
+        names = [row[0] for row in conn.execute("SELECT name FROM submissions ORDER BY submission_id")]
+        responses = conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+    finally:
+        conn.close()
+    assert names[0] == "Varun"
+    assert len(names) == 2
+    assert responses == 30
@@ -0,0 +1,45 @@
+import polars as pl
+import pytest
+from table_schema import infer_schema, typed_frame
+
+
+def test_leading_zero_codes_stay_text():
+    df = pl.DataFrame({
+        "code": ["007", "012", "100"],
+        "amount": ["1.5", "-2", "0"],
+    })
+
+    typed, schema = typed_frame(df)
+
+    assert schema["code"] == pl.String
+    assert schema["amount"] == pl.Float64
+    assert typed["code"].to_list() == ["007", "012", "100"]
+
+
+def test_numbers_that_dont_round_trip_stay_text():
+    df = pl.DataFrame({
+        "exponent": ["1e3", "2"],
+        "long_id": ["12345678901234567", "1"],
+    })
+
+    assert infer_schema(df) == {"exponent": pl.String, "long_id": pl.String}
+
+
+def test_saved_schema_is_not_applied_to_leading_zero_codes():
+    df = pl.DataFrame({"code": ["7", "007"]})
+
+    typed, schema = typed_frame(df, {"code": pl.Float64})
+
+    assert schema["code"] == pl.String
+    assert typed["code"].to_list() == ["7", "007"]
+
+
+def test_pasted_leading_zero_codes_stay_text():
+    pasted_tables = pytest.importorskip("pasted_tables")
+
+    df = pasted_tables.parse_pasted_table("code\tamount\n007\t1.5\n012\t2\n")
+    typed, schema = typed_frame(df)
+
+    assert schema["code"] == pl.String
+    assert typed["code"].to_list() == ["007", "012"]
+    assert typed["amount"].to_list() == [1.5, 2.0]